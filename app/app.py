@@ -1,13 +1,96 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from sqlalchemy import exc
 
 from app.auth.route import auth_router
-from app.db.database import setup_db
+from app.auth.session_tokens import refresh_revocation_list_periodically
+from app.db.database import (
+    async_engine,
+    async_session_maker,
+    engine,
+    replica_engine,
+    setup_db,
+)
+from app.db.replica import ReadYourWritesMiddleware, monitor_replica_lag_periodically
+from app.env import (
+    FORWARDED_ALLOW_IPS,
+    GRACEFUL_SHUTDOWN_SECONDS,
+    HOST,
+    KEEP_ALIVE_TIMEOUT_SECONDS,
+    LIMIT_MAX_REQUESTS,
+    PORT,
+    SESSION_MODE,
+    SESSION_SECRET,
+    SWEEP_INTERVAL_SECONDS,
+    UVICORN_HTTP,
+    UVICORN_LOOP,
+    WORKERS,
+)
+from app.routes.admin import admin_router
+from app.routes.event import event_router
+from app.routes.metrics import metrics_router
+from app.routes.search import search_router
 from app.routes.survey import survey_router
+from app.services.cache import read_model_cache
+from app.services.email import email_outbox
+from app.services.live_results import live_results
+from app.services.metrics import RequestMetricsMiddleware
+from app.services.profiling import ProfilingMiddleware
+from app.services.sweeper import sweep_expired_sessions_periodically
+from app.utils.responses import FastJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SESSION_MODE == "signed" and not SESSION_SECRET:
+        raise ValueError("SESSION_SECRET must be set when SESSION_MODE is signed")
+    background_tasks: list[asyncio.Task] = []
+    if SESSION_MODE == "signed":
+        background_tasks.append(
+            asyncio.create_task(
+                refresh_revocation_list_periodically(async_session_maker)
+            )
+        )
+    if SWEEP_INTERVAL_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                sweep_expired_sessions_periodically(async_session_maker)
+            )
+        )
+    if replica_engine is not None:
+        background_tasks.append(asyncio.create_task(monitor_replica_lag_periodically()))
+    background_tasks.append(asyncio.create_task(read_model_cache.listen()))
+    background_tasks.append(asyncio.create_task(live_results.listen()))
+    await email_outbox.start(async_session_maker)
+    yield
+    await email_outbox.stop()
+    for task in background_tasks:
+        task.cancel()
+    await read_model_cache.backend.close()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(ProfilingMiddleware)
 app.include_router(auth_router, prefix="/v1")
 app.include_router(survey_router, prefix="/v1")
+app.include_router(event_router, prefix="/v1")
+app.include_router(search_router, prefix="/v1")
+app.include_router(admin_router, prefix="/v1")
+app.include_router(metrics_router)
+
+
+@app.exception_handler(exc.TimeoutError)
+async def database_busy(request: Request, error: exc.TimeoutError):
+    # No pooled connection freed up within DB_POOL_TIMEOUT.
+    return FastJSONResponse({"detail": "Database busy"}, status_code=503)
 
 
 def start_application():
@@ -16,8 +99,23 @@ def start_application():
     except Exception as e:
         print(f"Error setting up database: {e}")
         exit(1)
-    uvicorn.run(app, host="localhost", port=8000)
+    # Migrations ran on this process's sync engine; release its connections
+    # before any worker is started.
+    engine.dispose()
+    uvicorn.run(
+        # Multiple workers need an import string so each one builds its own app.
+        "app.app:app" if WORKERS > 1 else app,
+        host=HOST,
+        port=PORT,
+        workers=WORKERS,
+        loop=UVICORN_LOOP,
+        http=UVICORN_HTTP,
+        timeout_keep_alive=KEEP_ALIVE_TIMEOUT_SECONDS,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS,
+        forwarded_allow_ips=FORWARDED_ALLOW_IPS,
+        limit_max_requests=LIMIT_MAX_REQUESTS or None,
+    )
 
 
 def debug_application():
-    uvicorn.run("app:app", host="localhost", port=8000, reload=True)
+    uvicorn.run("app.app:app", host=HOST, port=PORT, reload=True)
@@ -4,17 +4,29 @@ from typing import Annotated
 from fastapi import Cookie, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import EmailStr
-from sqlmodel import Session
+from sqlalchemy.orm import joinedload
+from sqlmodel import col, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.db.database import generate_database_session
+from app.auth.session_cache import session_cache
+from app.auth.session_tokens import (
+    is_signed_token,
+    issue_session_token,
+    revoke_session_token,
+    revoke_user_session_tokens,
+    user_from_claims,
+    verify_session_token,
+)
 from app.db.models import AuthSession, LoginSession, User
-from app.env import SERVER_URL
-from app.services.email import send_email
+from app.db.replica import generate_read_database_session
+from app.env import SERVER_URL, SESSION_MODE
+from app.services.email import queue_email
 
-def register_user(username: str, email: EmailStr, db_session: Session):
+
+async def register_user(username: str, email: EmailStr, db_session: AsyncSession):
     user = User(email=email, username=username)
     db_session.add(user)
-    db_session.commit()
+    await db_session.commit()
     response = JSONResponse(
         content={
             "message": "You were successfully registered",
@@ -25,18 +37,17 @@ def register_user(username: str, email: EmailStr, db_session: Session):
     return response
 
 
-def login_user(email: EmailStr, db_session: Session):
-    user = db_session.get(User, email)
+async def login_user(email: EmailStr, db_session: AsyncSession):
+    user = await db_session.get(User, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     login_session = LoginSession(user_email=user.email)
     db_session.add(login_session)
-    db_session.commit()
-    db_session.refresh(login_session)
-    send_email(
+    await queue_email(
         email=email,
         subject="Linux and open-source lovers community login link",
         message=f"{SERVER_URL}/v1/auth/token?token={login_session.id}",
+        db_session=db_session,
     )
     response = JSONResponse(
         content={
@@ -47,45 +58,91 @@ def login_user(email: EmailStr, db_session: Session):
     return response
 
 
-def verify_login_token(
+async def verify_login_token(
     token: str,
-    db_session: Session,
+    db_session: AsyncSession,
     from_url: str,
 ):
-    login_session = db_session.get(LoginSession, token)
+    login_session = await db_session.get(LoginSession, token)
     if not login_session:
         raise HTTPException(status_code=404, detail="Token not found")
     if login_session.expires_at < datetime.now():
-        db_session.delete(login_session)
-        db_session.commit()
+        await db_session.delete(login_session)
+        await db_session.commit()
         raise HTTPException(status_code=401, detail="Token expired")
-    user = login_session.user
+    user = await login_session.awaitable_attrs.user
     if not user:
         raise HTTPException(status_code=401, detail="Invalid login session")
 
-    auth_session = AuthSession(user_email=user.email)
-    db_session.add(auth_session)
-    db_session.commit()
-    db_session.refresh(auth_session)
+    if SESSION_MODE == "signed":
+        session_token, _ = issue_session_token(user)
+    else:
+        auth_session = AuthSession(user_email=user.email)
+        db_session.add(auth_session)
+        await db_session.commit()
+        await db_session.refresh(auth_session)
+        session_token = auth_session.id
     response = JSONResponse(content={"redirect": from_url}, status_code=200)
-    response.set_cookie(key="session", value=auth_session.id, httponly=True)
+    response.set_cookie(key="session", value=session_token, httponly=True)
     return response
 
 
-def get_current_user(
-    db_session: Annotated[Session, Depends(generate_database_session)],
+async def logout_user(session: str | None, db_session: AsyncSession):
+    if session and is_signed_token(session):
+        claims = verify_session_token(session)
+        if claims:
+            await revoke_session_token(claims, db_session)
+    elif session:
+        auth_session = await db_session.get(AuthSession, session)
+        if auth_session:
+            await db_session.delete(auth_session)
+            await db_session.commit()
+    response = JSONResponse(content={"message": "Logged out"}, status_code=200)
+    response.delete_cookie(key="session", httponly=True)
+    return response
+
+
+def delete_user_sessions_stmt(email: str):
+    return delete(AuthSession).where(col(AuthSession.user_email) == email)
+
+
+async def revoke_user_sessions(email: str, user: User, db_session: AsyncSession):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    await db_session.exec(delete_user_sessions_stmt(email))
+    session_cache.invalidate_user(email)
+    await revoke_user_session_tokens(email, db_session)
+    return JSONResponse(
+        content={"message": "User sessions revoked successfully"}, status_code=200
+    )
+
+
+async def get_current_user(
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
     session: Annotated[str | None, Cookie()] = None,
 ):
     if not session:
         raise HTTPException(status_code=401, detail="Invalid session")
-    auth_session = db_session.get(AuthSession, session)
+    if is_signed_token(session):
+        claims = verify_session_token(session)
+        if not claims:
+            raise HTTPException(status_code=401, detail="Invalid session")
+        return user_from_claims(claims)
+    cached_user = session_cache.get(session)
+    if cached_user:
+        return cached_user
+    auth_session = await db_session.get(
+        AuthSession,
+        session,
+        options=[joinedload(AuthSession.user)],
+    )
     if not auth_session:
         raise HTTPException(status_code=401, detail="Invalid session")
     if auth_session.expires_at < datetime.now():
-        db_session.delete(auth_session)
-        db_session.commit()
+        # Lookups may run on a replica, so the row is left for the sweeper.
         raise HTTPException(status_code=401, detail="Session expired")
     user = auth_session.user
     if not user:
         raise HTTPException(status_code=401, detail="Invalid session")
+    session_cache.set(session, user, auth_session.expires_at)
     return user
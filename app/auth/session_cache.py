@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.db.models import AuthSession, User
+from app.env import SESSION_CACHE_MAX_SIZE, SESSION_CACHE_TTL_SECONDS
+
+
+class SessionCache:
+    """Bounded LRU mapping of session ids to user snapshots.
+
+    Entries live until the earliest of the cache TTL and the session's own
+    `expires_at`, so a cached lookup never outlives the session it mirrors.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, datetime, dict]] = OrderedDict()
+        self._sessions_by_email: dict[str, set[str]] = {}
+
+    def get(self, session_id: str) -> User | None:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        cached_until, expires_at, snapshot = entry
+        if cached_until < time.monotonic() or expires_at < datetime.now():
+            self.invalidate(session_id)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(session_id)
+        self.hits += 1
+        return User(**snapshot)
+
+    def set(self, session_id: str, user: User, expires_at: datetime):
+        if self.max_size <= 0:
+            return
+        self.invalidate(session_id)
+        snapshot = {
+            "email": user.email,
+            "id": user.id,
+            "username": user.username,
+            "account_type": user.account_type,
+        }
+        self._entries[session_id] = (time.monotonic() + self.ttl, expires_at, snapshot)
+        self._sessions_by_email.setdefault(user.email, set()).add(session_id)
+        while len(self._entries) > self.max_size:
+            oldest, (_, _, oldest_snapshot) = self._entries.popitem(last=False)
+            self._forget(oldest, oldest_snapshot["email"])
+            self.evictions += 1
+
+    def invalidate(self, session_id: str):
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._forget(session_id, entry[2]["email"])
+
+    def invalidate_user(self, email: str):
+        for session_id in self._sessions_by_email.pop(email, set()):
+            self._entries.pop(session_id, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._sessions_by_email.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _forget(self, session_id: str, email: str):
+        session_ids = self._sessions_by_email.get(email)
+        if session_ids is None:
+            return
+        session_ids.discard(session_id)
+        if not session_ids:
+            del self._sessions_by_email[email]
+
+
+session_cache = SessionCache(
+    max_size=SESSION_CACHE_MAX_SIZE, ttl=SESSION_CACHE_TTL_SECONDS
+)
+
+
+@event.listens_for(Session, "after_flush")
+def invalidate_flushed_sessions(db_session: Session, flush_context):
+    for obj in db_session.deleted:
+        if isinstance(obj, AuthSession):
+            session_cache.invalidate(obj.id)
+        elif isinstance(obj, User):
+            session_cache.invalidate_user(obj.email)
+    for obj in db_session.dirty:
+        if (
+            isinstance(obj, User)
+            and inspect(obj).attrs.account_type.history.has_changes()
+        ):
+            session_cache.invalidate_user(obj.email)
@@ -0,0 +1,199 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.models import RevokedSession, User
+from app.env import SESSION_MODE, SESSION_REVOCATION_REFRESH_SECONDS, SESSION_SECRET
+from app.utils.crypto import gen_id
+
+TOKEN_VERSION = "v1"
+TOKEN_LIFETIME = timedelta(days=30)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    if not SESSION_SECRET:
+        raise ValueError("Session secret not set")
+    digest = hmac.new(
+        SESSION_SECRET.encode(),
+        f"{TOKEN_VERSION}.{payload}".encode(),
+        hashlib.sha256,
+    ).digest()
+    return _b64encode(digest)
+
+
+def is_signed_token(token: str) -> bool:
+    return token.startswith(f"{TOKEN_VERSION}.")
+
+
+def issue_session_token(user: User) -> tuple[str, datetime]:
+    issued_at = datetime.now()
+    expires_at = issued_at + TOKEN_LIFETIME
+    claims = {
+        "jti": gen_id(16),
+        "sub": user.email,
+        "uid": str(user.id),
+        "name": user.username,
+        "role": user.account_type,
+        "iat": issued_at.timestamp(),
+        "exp": expires_at.timestamp(),
+    }
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{TOKEN_VERSION}.{payload}.{_sign(payload)}", expires_at
+
+
+def verify_session_token(token: str) -> dict | None:
+    if not SESSION_SECRET or not is_signed_token(token):
+        return None
+    try:
+        _, payload, signature = token.split(".")
+        if not hmac.compare_digest(signature, _sign(payload)):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if "uid" not in claims or claims["exp"] < datetime.now().timestamp():
+        return None
+    if revocation_list.is_revoked(claims):
+        return None
+    return claims
+
+
+def user_from_claims(claims: dict) -> User:
+    return User(
+        email=claims["sub"],
+        id=UUID(claims["uid"]),
+        username=claims["name"],
+        account_type=claims["role"],
+    )
+
+
+class RevocationList:
+    """In-memory copy of the unexpired rows of the revokedsession table.
+
+    A row with a `token_id` revokes a single token (logout); a row with only a
+    `user_email` revokes every token issued to that user before `revoked_at`.
+    """
+
+    def __init__(self):
+        self.token_ids: set[str] = set()
+        self.users: dict[str, float] = {}
+
+    def is_revoked(self, claims: dict) -> bool:
+        if claims["jti"] in self.token_ids:
+            return True
+        revoked_at = self.users.get(claims["sub"])
+        return revoked_at is not None and claims["iat"] <= revoked_at
+
+    def add(self, revoked_session: RevokedSession):
+        if revoked_session.token_id:
+            self.token_ids.add(revoked_session.token_id)
+        elif revoked_session.user_email:
+            self.users[revoked_session.user_email] = max(
+                self.users.get(revoked_session.user_email, 0.0),
+                revoked_session.revoked_at.timestamp(),
+            )
+
+    async def refresh(self, db_session: AsyncSession):
+        stmt = select(RevokedSession).where(RevokedSession.expires_at > datetime.now())
+        revoked_sessions = (await db_session.exec(stmt)).all()
+        fresh = RevocationList()
+        for revoked_session in revoked_sessions:
+            fresh.add(revoked_session)
+        self.token_ids = fresh.token_ids
+        self.users = fresh.users
+
+
+revocation_list = RevocationList()
+
+
+async def revoke_session_token(claims: dict, db_session: AsyncSession):
+    revoked_session = RevokedSession(
+        token_id=claims["jti"],
+        user_email=claims["sub"],
+        expires_at=datetime.fromtimestamp(claims["exp"]),
+    )
+    db_session.add(revoked_session)
+    await db_session.commit()
+    revocation_list.add(revoked_session)
+
+
+async def revoke_user_session_tokens(email: str, db_session: AsyncSession):
+    revoked_session = RevokedSession(
+        user_email=email,
+        expires_at=datetime.now() + TOKEN_LIFETIME,
+    )
+    db_session.add(revoked_session)
+    await db_session.commit()
+    revocation_list.add(revoked_session)
+
+
+async def refresh_revocation_list_periodically(session_maker):
+    while True:
+        try:
+            async with session_maker() as db_session:
+                await revocation_list.refresh(db_session)
+        except Exception as e:
+            print(f"Error refreshing session revocation list: {e}")
+        await asyncio.sleep(SESSION_REVOCATION_REFRESH_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def revoke_tokens_of_changed_users(db_session: Session, flush_context):
+    # Tokens carry the role they were issued with, so a role change or a
+    # deleted user revokes every token issued so far, in the same
+    # transaction.
+    if SESSION_MODE != "signed":
+        return
+    emails = [obj.email for obj in db_session.deleted if isinstance(obj, User)]
+    emails += [
+        obj.email
+        for obj in db_session.dirty
+        if isinstance(obj, User)
+        and inspect(obj).attrs.account_type.history.has_changes()
+    ]
+    if not emails:
+        return
+    revoked_at = datetime.now()
+    revoked_sessions = [
+        RevokedSession(
+            id=gen_id(),
+            user_email=email,
+            revoked_at=revoked_at,
+            expires_at=revoked_at + TOKEN_LIFETIME,
+        )
+        for email in emails
+    ]
+    db_session.connection().execute(
+        insert(RevokedSession),
+        [revoked_session.model_dump() for revoked_session in revoked_sessions],
+    )
+    db_session.info.setdefault("revoked_sessions", []).extend(revoked_sessions)
+
+
+@event.listens_for(Session, "after_commit")
+def apply_committed_revocations(db_session: Session):
+    # Other workers pick the rows up on their next refresh.
+    for revoked_session in db_session.info.pop("revoked_sessions", []):
+        revocation_list.add(revoked_session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_rolled_back_revocations(db_session: Session, previous_transaction):
+    db_session.info.pop("revoked_sessions", None)
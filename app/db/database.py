@@ -1,14 +1,222 @@
-from sqlmodel import Session, SQLModel, create_engine
+import os
+import time
+from pathlib import Path
+from typing import Annotated, cast
+
+from alembic import command
+from alembic.config import Config
+from fastapi import Depends
+from sqlalchemy import event, exc, inspect, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlmodel import create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.env import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_REPLICA_STRING,
+    DB_STATEMENT_TIMEOUT_MS,
+    DB_STRING,
+    SLOW_QUERY_LOG_SIZE,
+    SLOW_QUERY_THRESHOLD_MS,
+)
+from app.utils.request_metrics import current_request_metrics
+from app.utils.slow_query_log import SlowQueryLog
+
+ALEMBIC_CONFIG_PATH = Path(__file__).resolve().parents[2] / "alembic.ini"
+INITIAL_REVISION = "63ac2434ba68"
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_SIZE)
+
+
+def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    context._statement_started = time.perf_counter()
+
+
+def record_statement_time(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - context._statement_started
+    metrics = current_request_metrics.get()
+    if metrics is not None:
+        metrics.record_statement(duration)
+    slow_query_log.record(
+        statement,
+        parameters,
+        executemany,
+        duration,
+        route=metrics.route() if metrics is not None else None,
+    )
+
+
+class PoolWaitStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float):
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self):
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "total_wait_seconds": self.total_wait,
+            "avg_wait_seconds": self.total_wait / self.checkouts
+            if self.checkouts
+            else 0.0,
+            "max_wait_seconds": self.max_wait,
+        }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Records how long each real checkout waits for a connection.
+
+    Sessions only check a connection out when they first need one, so requests
+    that never touch the database never wait here.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_wait_stats.timeouts += 1
+            raise
+        wait = time.perf_counter() - started
+        pool_wait_stats.record(wait)
+        metrics = current_request_metrics.get()
+        if metrics is not None:
+            metrics.record_pool_wait(wait)
+        return connection
+
+
+def create_database_engine(url: str):
+    async_engine = create_async_engine(
+        make_url(url).set(drivername="postgresql+asyncpg"),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        poolclass=TimedQueuePool,
+        connect_args={
+            "server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        },
+    )
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute", start_statement_timer
+    )
+    event.listen(
+        async_engine.sync_engine, "after_cursor_execute", record_statement_time
+    )
+    return async_engine
 
-from app.env import DB_STRING
 
 engine = create_engine(f"{DB_STRING}")
+async_engine = create_database_engine(f"{DB_STRING}")
+async_session_maker = async_sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False
+)
+# Optional read replica; read-only endpoints are routed to it by app.db.replica.
+replica_engine: AsyncEngine | None = None
+replica_session_maker: async_sessionmaker[AsyncSession] | None = None
+if DB_REPLICA_STRING:
+    replica_engine = create_database_engine(DB_REPLICA_STRING)
+    replica_session_maker = async_sessionmaker(
+        replica_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+
+def dispose_engines_after_fork():
+    # Pooled connections must never be shared between processes. close=False
+    # drops the inherited connections without closing the parent's sockets,
+    # and each engine starts over with a fresh, empty pool in the child.
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    if replica_engine is not None:
+        replica_engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=dispose_engines_after_fork)
+
+
+def get_pool_status():
+    pool = cast(QueuePool, async_engine.pool)
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "wait": pool_wait_stats.to_dict(),
+    }
 
 
 def setup_db():
-    SQLModel.metadata.create_all(engine)
+    config = Config(str(ALEMBIC_CONFIG_PATH))
+    config.set_main_option(
+        "script_location", str(ALEMBIC_CONFIG_PATH.parent / "migrations")
+    )
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        connection.commit()
+        if "user" in tables and "alembic_version" not in tables:
+            # Databases created before migrations existed (through
+            # SQLModel.metadata.create_all) already match the initial revision.
+            command.stamp(config, INITIAL_REVISION)
+        command.upgrade(config, "head")
+        connection.commit()
+
+
+class RequestSessions:
+    """The sessions opened while handling one request, at most one per engine.
+
+    Dependencies that ask for the primary share a single session, so routing
+    reads elsewhere never costs a second primary connection.
+    """
+
+    def __init__(self):
+        self.primary: AsyncSession | None = None
+        self.replica: AsyncSession | None = None
+
+    async def get_primary(self):
+        if self.primary is None:
+            self.primary = async_session_maker()
+        return self.primary
+
+    async def get_replica(self):
+        if replica_session_maker is None:
+            return await self.get_primary()
+        if self.replica is None:
+            self.replica = replica_session_maker()
+        return self.replica
+
+    async def close(self):
+        for session in (self.primary, self.replica):
+            if session is not None:
+                await session.close()
+
+
+async def generate_request_sessions():
+    sessions = RequestSessions()
+    try:
+        yield sessions
+    finally:
+        await sessions.close()
 
 
-def generate_database_session():
-    with Session(engine) as session:
-        yield session
+async def generate_database_session(
+    sessions: Annotated[RequestSessions, Depends(generate_request_sessions)],
+):
+    return await sessions.get_primary()
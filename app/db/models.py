@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 from typing import List
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlmodel import Field, Relationship, SQLModel, String
 
 from app.utils.crypto import gen_id
@@ -13,7 +15,17 @@ class EventUserLink(SQLModel, table=True):
     user_email: str = Field(foreign_key="user.email", primary_key=True)
 
 
-class User(SQLModel, table=True):
+class EventWaitlist(SQLModel, table=True):
+    # Promotions pop the oldest entry of an event first.
+    __table_args__ = (
+        sa.Index("ix_eventwaitlist_event_id_created_at", "event_id", "created_at"),
+    )
+    event_id: uuid.UUID = Field(foreign_key="event.id", primary_key=True)
+    user_email: str = Field(foreign_key="user.email", primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+class User(AsyncAttrs, SQLModel, table=True):
     email: str = Field(primary_key=True)
     id: uuid.UUID = Field(default_factory=uuid.uuid4)
     username: str
@@ -29,38 +41,71 @@ class User(SQLModel, table=True):
     )
 
 
-class AuthSession(SQLModel, table=True):
+class AuthSession(AsyncAttrs, SQLModel, table=True):
     id: str = Field(default_factory=gen_id, primary_key=True)
-    user_email: str = Field(foreign_key="user.email")
+    user_email: str = Field(foreign_key="user.email", index=True)
     user: User = Relationship(back_populates="session_token")
     expires_at: datetime = Field(
-        default_factory=lambda: datetime.now() + timedelta(days=30)
+        default_factory=lambda: datetime.now() + timedelta(days=30), index=True
     )
 
 
-class LoginSession(SQLModel, table=True):
+class LoginSession(AsyncAttrs, SQLModel, table=True):
     id: str = Field(default_factory=gen_id, primary_key=True)
-    user_email: str = Field(foreign_key="user.email")
+    user_email: str = Field(foreign_key="user.email", index=True)
     user: User = Relationship(back_populates="login_session")
     expires_at: datetime = Field(
-        default_factory=lambda: datetime.now() + timedelta(hours=1)
+        default_factory=lambda: datetime.now() + timedelta(hours=1), index=True
     )
 
 
-class Survey(SQLModel, table=True):
+class RevokedSession(SQLModel, table=True):
+    id: str = Field(default_factory=gen_id, primary_key=True)
+    token_id: str | None = Field(default=None)
+    user_email: str | None = Field(default=None)
+    revoked_at: datetime = Field(default_factory=datetime.now)
+    expires_at: datetime = Field(index=True)
+
+
+class OutboxEmail(SQLModel, table=True):
+    __table_args__ = (
+        sa.Index(
+            "ix_outboxemail_due",
+            "next_attempt_at",
+            postgresql_where=sa.text("status = 'pending'"),
+        ),
+    )
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    recipient: str
+    subject: str
+    message: str
+    status: str = Field(default="pending")  # pending, sent, failed
+    attempts: int = Field(default=0)
+    # Pending emails are not sent before this; it is pushed back on failure.
+    next_attempt_at: datetime = Field(default_factory=datetime.now)
+    last_error: str | None = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.now)
+    sent_at: datetime | None = Field(default=None)
+
+
+class Survey(AsyncAttrs, SQLModel, table=True):
+    __table_args__ = (
+        sa.Index("ix_survey_active_id", "id", postgresql_where=sa.text("active")),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     author_email: str = Field(foreign_key="user.email")
     title: str
     description: str
     active: bool = Field(default=False)
+    version: int = Field(default=1)
     questions: list["SurveyQuestion"] = Relationship(back_populates="survey")
     responses: list["SurveyResponse"] = Relationship(back_populates="survey")
     author: User = Relationship(back_populates="surveys")
 
 
-class SurveyQuestion(SQLModel, table=True):
+class SurveyQuestion(AsyncAttrs, SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    survey_id: uuid.UUID = Field(foreign_key="survey.id")
+    survey_id: uuid.UUID = Field(foreign_key="survey.id", index=True)
     survey: Survey = Relationship(back_populates="questions")
     author_email: str = Field(foreign_key="user.email")
     question_type: str = Field(default="select")  # select, mutliselect, text
@@ -69,10 +114,19 @@ class SurveyQuestion(SQLModel, table=True):
     author: User = Relationship(back_populates="survey_questions")
 
 
-class SurveyResponse(SQLModel, table=True):
+class SurveyResponse(AsyncAttrs, SQLModel, table=True):
+    __table_args__ = (
+        sa.Index("ix_surveyresponse_survey_id_id", "survey_id", "id"),
+        # One response per responder and question.
+        sa.UniqueConstraint(
+            "question_id",
+            "responder_email",
+            name="surveyresponse_question_id_responder_email_key",
+        ),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    responder_email: str = Field(foreign_key="user.email")
-    question_id: uuid.UUID = Field(foreign_key="surveyquestion.id", unique=True)
+    responder_email: str = Field(foreign_key="user.email", index=True)
+    question_id: uuid.UUID = Field(foreign_key="surveyquestion.id")
     survey_id: uuid.UUID = Field(foreign_key="survey.id")
     survey: Survey = Relationship(back_populates="responses")
     question: SurveyQuestion = Relationship(back_populates="responses")
@@ -80,15 +134,51 @@ class SurveyResponse(SQLModel, table=True):
     responder: User = Relationship(back_populates="survey_responses")
 
 
-class Event(SQLModel, table=True):
+class SurveyAnswerCount(SQLModel, table=True):
+    question_id: uuid.UUID = Field(foreign_key="surveyquestion.id", primary_key=True)
+    value: str = Field(primary_key=True)
+    survey_id: uuid.UUID = Field(foreign_key="survey.id", index=True)
+    count: int = Field(default=0)
+
+
+class Event(AsyncAttrs, SQLModel, table=True):
+    # Upcoming/past listings walk (date, id) in either direction.
+    __table_args__ = (sa.Index("ix_event_date_id", "date", "id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str
     description: str
     date: datetime
     location: str
     cover_image_url: str
+    capacity: int | None = Field(default=None)
+    # Kept in step with the EventUserLink rows by join/leave.
+    participant_count: int = Field(default=0)
     author_email: str = Field(foreign_key="user.email")
     author: User = Relationship(back_populates="events_created")
     participants: List["User"] = Relationship(
         back_populates="events", link_model=EventUserLink
     )
+
+
+def add_search_vector(table: sa.Table, weighted_columns: dict[str, str]):
+    """Adds a `search_vector` tsvector column that Postgres computes from the
+    given columns (name -> weight) on every write, with a GIN index on it.
+
+    The column is left out of the ORM mapping so row loads never fetch it.
+    """
+    expression = " || ".join(
+        f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted_columns.items()
+    )
+    column = sa.Column(
+        "search_vector",
+        TSVECTOR,
+        sa.Computed(expression, persisted=True),
+        nullable=True,
+    )
+    table.append_column(column)
+    sa.Index(f"ix_{table.name}_search_vector", column, postgresql_using="gin")
+
+
+add_search_vector(Survey.__table__, {"title": "A", "description": "B"})
+add_search_vector(Event.__table__, {"title": "A", "location": "B", "description": "C"})
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Annotated
+
+from fastapi import Depends, Request
+from sqlalchemy import event, text
+
+from app.db.database import (
+    RequestSessions,
+    async_engine,
+    async_session_maker,
+    generate_request_sessions,
+    replica_engine,
+    replica_session_maker,
+)
+from app.env import (
+    READ_YOUR_WRITES_SECONDS,
+    REPLICA_LAG_CHECK_SECONDS,
+    REPLICA_MAX_LAG_SECONDS,
+)
+
+PRIMARY_UNTIL_COOKIE = "primary_until"
+
+# A replica that has replayed everything it received is caught up, however
+# old its last replayed transaction is; only a replay backlog counts as lag.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+class ReplicaStatus:
+    def __init__(self):
+        self.lag: float | None = None
+        self.checked_at: float | None = None
+        self.error: str | None = None
+
+    def record(self, lag: float):
+        self.lag = lag
+        self.checked_at = time.monotonic()
+        self.error = None
+
+    def record_failure(self, error: str):
+        self.lag = None
+        self.checked_at = time.monotonic()
+        self.error = error
+
+    @property
+    def healthy(self):
+        if self.lag is None or self.checked_at is None:
+            return False
+        # A monitor that stopped reporting is treated like a lagging replica.
+        stale = time.monotonic() - self.checked_at > 3 * REPLICA_LAG_CHECK_SECONDS
+        return not stale and self.lag <= REPLICA_MAX_LAG_SECONDS
+
+    def to_dict(self):
+        return {
+            "configured": replica_engine is not None,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "max_lag_seconds": REPLICA_MAX_LAG_SECONDS,
+            "error": self.error,
+        }
+
+
+replica_status = ReplicaStatus()
+
+
+async def check_replica_lag():
+    if replica_engine is None:
+        return
+    try:
+        async with replica_engine.connect() as connection:
+            lag = (await connection.execute(REPLICA_LAG_QUERY)).scalar_one()
+        replica_status.record(float(lag))
+    except Exception as e:
+        print(f"Error checking replica lag: {e}")
+        replica_status.record_failure(str(e))
+
+
+async def monitor_replica_lag_periodically():
+    while True:
+        await check_replica_lag()
+        await asyncio.sleep(REPLICA_LAG_CHECK_SECONDS)
+
+
+def prefers_primary(request: Request):
+    if replica_engine is None or not replica_status.healthy:
+        return True
+    try:
+        primary_until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, "0"))
+    except ValueError:
+        return False
+    return primary_until > time.time()
+
+
+def read_session_maker():
+    """Session factory for read-only work outside a request's dependencies."""
+    if replica_session_maker is None or not replica_status.healthy:
+        return async_session_maker
+    return replica_session_maker
+
+
+async def generate_read_database_session(
+    request: Request,
+    sessions: Annotated[RequestSessions, Depends(generate_request_sessions)],
+):
+    """A session for read-only work: the replica unless the caller wrote
+    recently or the replica is lagging, in which case the primary."""
+    if prefers_primary(request):
+        return await sessions.get_primary()
+    return await sessions.get_replica()
+
+
+class RequestWrites:
+    def __init__(self):
+        self.committed = False
+
+
+current_request_writes: ContextVar[RequestWrites | None] = ContextVar(
+    "current_request_writes", default=None
+)
+
+
+@event.listens_for(async_engine.sync_engine, "commit")
+def mark_primary_commit(conn):
+    writes = current_request_writes.get()
+    if writes is not None:
+        writes.committed = True
+
+
+class ReadYourWritesMiddleware:
+    """Pins a client's reads to the primary for a short window after any
+    request of theirs committed on it, so they never read past their own
+    write from a replica that has not replayed it yet."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or replica_engine is None:
+            await self.app(scope, receive, send)
+            return
+
+        writes = RequestWrites()
+        token = current_request_writes.set(writes)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and writes.committed:
+                primary_until = time.time() + READ_YOUR_WRITES_SECONDS
+                cookie = (
+                    f"{PRIMARY_UNTIL_COOKIE}={primary_until:.3f}; "
+                    f"Max-Age={READ_YOUR_WRITES_SECONDS}; Path=/; HttpOnly; "
+                    "SameSite=Lax"
+                )
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"set-cookie", cookie.encode()),
+                    ],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            current_request_writes.reset(token)
@@ -10,3 +10,79 @@ GOOGLE_APP_PASSWORD = os.getenv("GOOGLE_APP_PASSWORD")
 APP_EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
 SERVER_URL = os.getenv("SERVER_URL")
 FRONTEND_URL = os.getenv("FRONTEND_URL")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+SESSION_CACHE_MAX_SIZE = int(os.getenv("SESSION_CACHE_MAX_SIZE", "10000"))
+SESSION_CACHE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_TTL_SECONDS", "60"))
+
+SESSION_MODE = os.getenv("SESSION_MODE", "database")  # database, signed
+SESSION_SECRET = os.getenv("SESSION_SECRET")
+SESSION_REVOCATION_REFRESH_SECONDS = float(
+    os.getenv("SESSION_REVOCATION_REFRESH_SECONDS", "30")
+)
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").lower() == "true"
+SMTP_USERNAME = os.getenv("SMTP_USERNAME", APP_EMAIL_ADDRESS)
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", GOOGLE_APP_PASSWORD)
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "2"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "20"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "2"))
+EMAIL_POLL_SECONDS = float(os.getenv("EMAIL_POLL_SECONDS", "5"))
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "20"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+SWEEP_INTERVAL_SECONDS = float(os.getenv("SWEEP_INTERVAL_SECONDS", "3600"))
+SWEEP_BATCH_SIZE = int(os.getenv("SWEEP_BATCH_SIZE", "1000"))
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # memory, redis
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_INVALIDATION_CHANNEL = os.getenv(
+    "CACHE_INVALIDATION_CHANNEL", "loslc:cache-invalidation"
+)
+READ_MODEL_CACHE_TTL_SECONDS = float(os.getenv("READ_MODEL_CACHE_TTL_SECONDS", "300"))
+READ_MODEL_LOCAL_TTL_SECONDS = float(os.getenv("READ_MODEL_LOCAL_TTL_SECONDS", "5"))
+READ_MODEL_CACHE_MAX_SIZE = int(os.getenv("READ_MODEL_CACHE_MAX_SIZE", "10000"))
+READ_MODEL_LOCAL_MAX_SIZE = int(os.getenv("READ_MODEL_LOCAL_MAX_SIZE", "1000"))
+READ_MODEL_LOAD_LOCK_SECONDS = float(os.getenv("READ_MODEL_LOAD_LOCK_SECONDS", "5"))
+
+HOST = os.getenv("HOST", "localhost")
+PORT = int(os.getenv("PORT", "8000"))
+WORKERS = int(os.getenv("WORKERS", "1"))
+UVICORN_LOOP = os.getenv("UVICORN_LOOP", "auto")  # auto, uvloop, asyncio
+UVICORN_HTTP = os.getenv("UVICORN_HTTP", "auto")  # auto, httptools, h11
+KEEP_ALIVE_TIMEOUT_SECONDS = int(os.getenv("KEEP_ALIVE_TIMEOUT_SECONDS", "5"))
+GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "30"))
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS")
+LIMIT_MAX_REQUESTS = int(os.getenv("LIMIT_MAX_REQUESTS", "0"))
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_SECONDS", "0.001"))
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+
+DB_REPLICA_STRING = os.getenv("DB_REPLICA_STRING")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+SEARCH_STATEMENT_TIMEOUT_MS = int(os.getenv("SEARCH_STATEMENT_TIMEOUT_MS", "2000"))
+LIVE_RESULTS_CHANNEL = os.getenv("LIVE_RESULTS_CHANNEL", "survey_results")
+LIVE_RESULTS_MIN_INTERVAL_SECONDS = float(
+    os.getenv("LIVE_RESULTS_MIN_INTERVAL_SECONDS", "1")
+)
+LIVE_RESULTS_HEARTBEAT_SECONDS = float(
+    os.getenv("LIVE_RESULTS_HEARTBEAT_SECONDS", "15")
+)
@@ -0,0 +1,77 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import EmailStr
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.auth.auth_service import get_current_user, revoke_user_sessions
+from app.auth.session_cache import session_cache
+from app.db.database import (
+    generate_database_session,
+    get_pool_status,
+    slow_query_log,
+)
+from app.db.models import User
+from app.db.replica import replica_status
+from app.services.cache import read_model_cache
+from app.services.live_results import live_results
+
+admin_router = APIRouter()
+
+
+@admin_router.get("/admin/db/pool")
+async def gt_pool_status(user: Annotated[User, Depends(get_current_user)]):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return get_pool_status()
+
+
+@admin_router.get("/admin/db/replica")
+async def gt_replica_status(user: Annotated[User, Depends(get_current_user)]):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return replica_status.to_dict()
+
+
+@admin_router.get("/admin/db/slow-queries")
+async def gt_slow_queries(user: Annotated[User, Depends(get_current_user)]):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "queries": list(reversed(slow_query_log.entries)),
+    }
+
+
+@admin_router.get("/admin/cache/sessions")
+async def gt_session_cache_stats(user: Annotated[User, Depends(get_current_user)]):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return session_cache.stats()
+
+
+@admin_router.get("/admin/cache/read-models")
+async def gt_read_model_cache_stats(
+    user: Annotated[User, Depends(get_current_user)],
+):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return read_model_cache.stats()
+
+
+@admin_router.get("/admin/live-results")
+async def gt_live_results_stats(
+    user: Annotated[User, Depends(get_current_user)],
+):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return live_results.stats()
+
+
+@admin_router.post("/admin/users/{email}/sessions/revoke")
+async def rvk_user_sessions(
+    email: EmailStr,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    return await revoke_user_sessions(email, user=user, db_session=db_session)
@@ -0,0 +1,88 @@
+from typing import Annotated, Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.auth.auth_service import get_current_user
+from app.db.database import generate_database_session
+from app.db.models import User
+from app.db.replica import generate_read_database_session
+from app.env import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.routes.schemas.event_schemas import EventSchema
+from app.routes.services.event_service import (
+    add_event,
+    delete_event,
+    get_event,
+    get_events,
+    join_event,
+    leave_event,
+    update_event,
+)
+
+event_router = APIRouter()
+
+
+@event_router.get("/events")
+async def gt_events(
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+    when: Literal["upcoming", "past"] = "upcoming",
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    return await get_events(when, limit=limit, db_session=db_session, cursor=cursor)
+
+
+@event_router.get("/events/{event_id}")
+async def gt_event(
+    event_id: str,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+):
+    return await get_event(UUID(event_id), db_session=db_session)
+
+
+@event_router.post("/event/create", status_code=201)
+async def create_event(
+    event: EventSchema,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    return await add_event(event, user=user, db_session=db_session)
+
+
+@event_router.put("/event/edit", status_code=201)
+async def upd_event(
+    event: EventSchema,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    return await update_event(event, user=user, db_session=db_session)
+
+
+@event_router.delete("/events/delete/{event_id}", status_code=204)
+async def del_event(
+    event_id: str,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    return await delete_event(UUID(event_id), user=user, db_session=db_session)
+
+
+@event_router.post("/events/{event_id}/join")
+async def jn_event(
+    event_id: str,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    return await join_event(UUID(event_id), user=user, db_session=db_session)
+
+
+@event_router.post("/events/{event_id}/leave")
+async def lv_event(
+    event_id: str,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    return await leave_event(UUID(event_id), user=user, db_session=db_session)
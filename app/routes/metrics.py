@@ -0,0 +1,22 @@
+import hmac
+from typing import Annotated
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.env import METRICS_TOKEN
+from app.services.metrics import request_metrics_registry
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def gt_metrics(authorization: Annotated[str | None, Header()] = None):
+    if METRICS_TOKEN and not hmac.compare_digest(
+        authorization or "", f"Bearer {METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return PlainTextResponse(
+        request_metrics_registry.render(),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.db.models import Event
+from app.routes.schemas.user_schemas import UserSchema
+
+
+class EventSchema(BaseModel):
+    id: str | None = None
+    title: str
+    description: str
+    date: datetime
+    location: str
+    cover_image_url: str
+    capacity: int | None = Field(default=None, ge=1)
+    author: UserSchema | None = None
+    participant_count: int = 0
+
+    @field_validator("date")
+    @classmethod
+    def naive_local_date(cls, date: datetime):
+        # Timestamps are stored without a time zone, in server local time.
+        if date.tzinfo is not None:
+            return date.astimezone().replace(tzinfo=None)
+        return date
+
+    @classmethod
+    def from_model(cls, event: Event):
+        return cls.model_validate(
+            {
+                "id": str(event.id),
+                "title": event.title,
+                "description": event.description,
+                "date": event.date,
+                "location": event.location,
+                "cover_image_url": event.cover_image_url,
+                "capacity": event.capacity,
+                "author": event.author,
+                "participant_count": event.participant_count,
+            }
+        )
@@ -0,0 +1,11 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class SearchResultSchema(BaseModel):
+    type: Literal["survey", "event"]
+    id: str
+    title: str
+    snippet: str
+    rank: float
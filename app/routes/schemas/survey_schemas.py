@@ -1,11 +1,25 @@
 import uuid
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, model_validator
 
 from app.db.models import Survey, SurveyQuestion, SurveyResponse
 from app.routes.schemas.user_schemas import UserSchema
 
 
+def check_answers(question_type: str, answers: list[str]) -> str | None:
+    match question_type:
+        case "select":
+            if len(answers) != 1:
+                return "Only one answer is allowed"
+        case "multiselect":
+            if len(answers) < 1:
+                return "At least one answer is required"
+        case "text":
+            if len(answers) != 1:
+                return "Only one answer is allowed"
+    return None
+
+
 class SurveySchema(BaseModel):
     id: str | None = None
     title: str
@@ -15,12 +29,15 @@ class SurveySchema(BaseModel):
 
     @classmethod
     def from_model(cls, survey: Survey):
-        return cls(
-            id=str(survey.id),
-            title=survey.title,
-            description=survey.description,
-            active=survey.active,
-            author=UserSchema.from_model(survey.author),
+        # The author row is validated in the same pass via from_attributes.
+        return cls.model_validate(
+            {
+                "id": str(survey.id),
+                "title": survey.title,
+                "description": survey.description,
+                "active": survey.active,
+                "author": survey.author,
+            }
         )
 
     def to_model(self):
@@ -33,6 +50,16 @@ class SurveySchema(BaseModel):
         )
 
 
+class NestedSurveyQuestionSchema(BaseModel):
+    id: str | None = None
+    title: str
+    question_type: str
+
+
+class SurveyWithQuestionsSchema(SurveySchema):
+    questions: list[NestedSurveyQuestionSchema] = []
+
+
 class SurveyQuestionSchema(BaseModel):
     id: str | None = None
     author: UserSchema
@@ -42,12 +69,14 @@ class SurveyQuestionSchema(BaseModel):
 
     @classmethod
     def from_model(cls, question: SurveyQuestion):
-        return cls(
-            id=str(question.id),
-            survey_id=question.survey_id,
-            title=question.title,
-            author=UserSchema.from_model(question.author),
-            question_type=question.question_type,
+        return cls.model_validate(
+            {
+                "id": str(question.id),
+                "survey_id": question.survey_id,
+                "title": question.title,
+                "author": question.author,
+                "question_type": question.question_type,
+            }
         )
 
     def to_model(self):
@@ -79,18 +108,12 @@ class SurveyResponseSchema(BaseModel):
             responder_email=response.responder_email,
         )
 
-    @field_validator("answers")
-    def validate_answers(cls, answers: list[str]):
-        match cls.response_type:
-            case "select":
-                if len(answers) != 1:
-                    raise ValueError("Only one answer is allowed")
-            case "multiselect":
-                if len(answers) < 1:
-                    raise ValueError("At least one answer is required")
-            case "text":
-                if len(answers) != 1:
-                    raise ValueError("Only one answer is allowed")
+    @model_validator(mode="after")
+    def validate_answers(self):
+        error = check_answers(self.response_type, self.answers)
+        if error:
+            raise ValueError(error)
+        return self
 
     def to_model(self):
         return SurveyResponse(
@@ -100,3 +123,19 @@ class SurveyResponseSchema(BaseModel):
             values=self.answers,
             responder_email=self.responder_email,
         )
+
+
+class SurveyQuestionResultSchema(BaseModel):
+    question_id: uuid.UUID
+    title: str
+    question_type: str
+    answers: dict[str, int]
+
+
+class SurveyQuestionAnswerSchema(BaseModel):
+    question_id: uuid.UUID
+    answers: list[str]
+
+
+class SurveySubmissionSchema(BaseModel):
+    answers: list[SurveyQuestionAnswerSchema]
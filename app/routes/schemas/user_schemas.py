@@ -1,9 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.db.models import User
 
 
 class UserSchema(BaseModel):
+    # Lets parent schemas take a User row as-is and validate it in one pass.
+    model_config = ConfigDict(from_attributes=True)
+
     username: str
     email: str
     account_type: str
@@ -0,0 +1,26 @@
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.auth.auth_service import get_current_user
+from app.db.models import User
+from app.db.replica import generate_read_database_session
+from app.env import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.routes.services.search_service import search
+
+search_router = APIRouter()
+
+
+@search_router.get("/search")
+async def srch(
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+    q: str = Query(min_length=1, max_length=200),
+    type: Literal["survey", "event"] | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    return await search(
+        q, type=type, limit=limit, user=user, db_session=db_session, cursor=cursor
+    )
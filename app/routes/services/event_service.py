@@ -0,0 +1,248 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.models import Event, EventUserLink, EventWaitlist, User
+from app.routes.schemas.event_schemas import EventSchema
+from app.routes.schemas.pagination_schemas import Page
+from app.utils.pagination import decode_cursor, split_page
+from app.utils.responses import FastJSONResponse
+
+
+def events_query():
+    return select(Event).options(selectinload(Event.author))
+
+
+def parse_event_cursor(value) -> tuple[datetime, UUID]:
+    date, id = value
+    return datetime.fromisoformat(date), UUID(id)
+
+
+async def get_events(
+    when: Literal["upcoming", "past"],
+    limit: int,
+    db_session: AsyncSession,
+    cursor: str | None = None,
+):
+    key = tuple_(col(Event.date), col(Event.id))
+    stmt = events_query()
+    now = datetime.now()
+    if when == "upcoming":
+        stmt = stmt.where(col(Event.date) >= now).order_by(
+            col(Event.date), col(Event.id)
+        )
+        if cursor:
+            stmt = stmt.where(key > tuple(decode_cursor(cursor, parse_event_cursor)))
+    else:
+        stmt = stmt.where(col(Event.date) < now).order_by(
+            col(Event.date).desc(), col(Event.id).desc()
+        )
+        if cursor:
+            stmt = stmt.where(key < tuple(decode_cursor(cursor, parse_event_cursor)))
+    rows = (await db_session.exec(stmt.limit(limit + 1))).all()
+    page, next_cursor = split_page(rows, limit, lambda event: [event.date, event.id])
+    return FastJSONResponse(
+        Page(
+            items=[EventSchema.from_model(event) for event in page],
+            next_cursor=next_cursor,
+        )
+    )
+
+
+async def get_event(id: UUID, db_session: AsyncSession):
+    stmt = events_query().where(col(Event.id) == id)
+    event = (await db_session.exec(stmt)).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return EventSchema.from_model(event)
+
+
+async def add_event(event: EventSchema, db_session: AsyncSession, user: User):
+    db_event = Event(
+        author_email=user.email,
+        title=event.title,
+        description=event.description,
+        date=event.date,
+        location=event.location,
+        cover_image_url=event.cover_image_url,
+        capacity=event.capacity,
+    )
+    db_session.add(db_event)
+    await db_session.commit()
+    await db_session.refresh(db_event)
+    await db_event.awaitable_attrs.author
+    return EventSchema.from_model(db_event)
+
+
+async def get_editable_event(id: UUID, user: User, db_session: AsyncSession):
+    event_in_db = await db_session.get(Event, id)
+    if not event_in_db:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if not event_in_db.author_email == user.email and not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return event_in_db
+
+
+async def update_event(event: EventSchema, db_session: AsyncSession, user: User):
+    if not event.id:
+        raise HTTPException(status_code=400, detail="Missing event id")
+    event_in_db = await get_editable_event(UUID(event.id), user, db_session)
+    event_in_db.title = event.title
+    event_in_db.description = event.description
+    event_in_db.date = event.date
+    event_in_db.location = event.location
+    event_in_db.cover_image_url = event.cover_image_url
+    event_in_db.capacity = event.capacity
+    db_session.add(event_in_db)
+    await db_session.flush()
+    # A raised or removed cap frees seats for the waitlist.
+    while await promote_from_waitlist(event_in_db.id, db_session):
+        pass
+    await db_session.commit()
+    await db_session.refresh(event_in_db)
+    await event_in_db.awaitable_attrs.author
+    return EventSchema.from_model(event_in_db)
+
+
+async def delete_event(id: UUID, user: User, db_session: AsyncSession):
+    event = await get_editable_event(id, user, db_session)
+    await db_session.exec(
+        delete(EventUserLink).where(col(EventUserLink.event_id) == id)
+    )
+    await db_session.exec(
+        delete(EventWaitlist).where(col(EventWaitlist.event_id) == id)
+    )
+    await db_session.delete(event)
+    await db_session.commit()
+    return JSONResponse(
+        content={"message": "Event deleted successfully"}, status_code=200
+    )
+
+
+async def take_seat(id: UUID, db_session: AsyncSession):
+    # The row lock taken by the UPDATE serializes concurrent seat grabs and the
+    # condition is re-checked against the committed count, so the counter can
+    # never pass the capacity.
+    stmt = (
+        update(Event)
+        .where(
+            col(Event.id) == id,
+            or_(
+                col(Event.capacity).is_(None),
+                col(Event.participant_count) < col(Event.capacity),
+            ),
+        )
+        .values(participant_count=col(Event.participant_count) + 1)
+        .returning(col(Event.id))
+    )
+    return (await db_session.exec(stmt)).first() is not None
+
+
+async def promote_from_waitlist(id: UUID, db_session: AsyncSession):
+    next_in_line = (
+        select(EventWaitlist)
+        .where(col(EventWaitlist.event_id) == id)
+        .order_by(col(EventWaitlist.created_at))
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    entry = (await db_session.exec(next_in_line)).first()
+    if not entry or not await take_seat(id, db_session):
+        return False
+    await db_session.delete(entry)
+    await db_session.exec(
+        insert(EventUserLink)
+        .values(event_id=id, user_email=entry.user_email)
+        .on_conflict_do_nothing(index_elements=["event_id", "user_email"])
+    )
+    return True
+
+
+async def join_event(id: UUID, user: User, db_session: AsyncSession):
+    # Joining twice, or racing another join of the same user, is a no-op
+    # rather than a unique violation.
+    stmt = (
+        insert(EventUserLink)
+        .values(event_id=id, user_email=user.email)
+        .on_conflict_do_nothing(index_elements=["event_id", "user_email"])
+        .returning(col(EventUserLink.event_id))
+    )
+    try:
+        inserted = (await db_session.exec(stmt)).first() is not None
+    except IntegrityError:
+        await db_session.rollback()
+        raise HTTPException(status_code=404, detail="Event not found")
+    if inserted and not await take_seat(id, db_session):
+        # Full. Hold the event row until the waitlist entry is committed, so
+        # a participant leaving meanwhile either frees a seat we see on the
+        # retry or promotes us once we are on the list.
+        await db_session.exec(
+            select(Event.id).where(col(Event.id) == id).with_for_update(key_share=True)
+        )
+        if not await take_seat(id, db_session):
+            await db_session.exec(
+                delete(EventUserLink).where(
+                    col(EventUserLink.event_id) == id,
+                    col(EventUserLink.user_email) == user.email,
+                )
+            )
+            await db_session.exec(
+                insert(EventWaitlist)
+                .values(event_id=id, user_email=user.email, created_at=datetime.now())
+                .on_conflict_do_nothing(index_elements=["event_id", "user_email"])
+            )
+            await db_session.commit()
+            return JSONResponse(
+                content={"message": "Event is full", "status": "waitlisted"},
+                status_code=202,
+            )
+    await db_session.exec(
+        delete(EventWaitlist).where(
+            col(EventWaitlist.event_id) == id,
+            col(EventWaitlist.user_email) == user.email,
+        )
+    )
+    await db_session.commit()
+    return JSONResponse(
+        content={"message": "Joined event", "status": "joined"}, status_code=200
+    )
+
+
+async def leave_event(id: UUID, user: User, db_session: AsyncSession):
+    # The waitlist entry goes first: if a promotion holds it, this waits for
+    # that promotion to commit and then removes the seat it granted.
+    waitlisted = await db_session.exec(
+        delete(EventWaitlist)
+        .where(
+            col(EventWaitlist.event_id) == id,
+            col(EventWaitlist.user_email) == user.email,
+        )
+        .returning(col(EventWaitlist.event_id))
+    )
+    if waitlisted.first() is None:
+        participant = await db_session.exec(
+            delete(EventUserLink)
+            .where(
+                col(EventUserLink.event_id) == id,
+                col(EventUserLink.user_email) == user.email,
+            )
+            .returning(col(EventUserLink.event_id))
+        )
+        if participant.first() is not None:
+            await db_session.exec(
+                update(Event)
+                .where(col(Event.id) == id)
+                .values(participant_count=col(Event.participant_count) - 1)
+            )
+            await promote_from_waitlist(id, db_session)
+    await db_session.commit()
+    return JSONResponse(content={"message": "Left event"}, status_code=200)
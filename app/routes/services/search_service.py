@@ -0,0 +1,126 @@
+import html
+from typing import Literal
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import func, literal, tuple_, union_all
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.models import Event, Survey, User
+from app.env import SEARCH_STATEMENT_TIMEOUT_MS
+from app.routes.schemas.pagination_schemas import Page
+from app.routes.schemas.search_schemas import SearchResultSchema
+from app.utils.pagination import decode_cursor, split_page
+from app.utils.responses import FastJSONResponse
+
+SEARCH_CONFIG = "english"
+QUERY_CANCELED = "57014"
+# ts_headline does not escape the text it returns, so matches are marked with
+# control characters and turned into <mark> tags after escaping.
+START_SEL, STOP_SEL = "\x02", "\x03"
+TITLE_OPTIONS = f"StartSel={START_SEL}, StopSel={STOP_SEL}, HighlightAll=true"
+SNIPPET_OPTIONS = (
+    f"StartSel={START_SEL}, StopSel={STOP_SEL}, MaxFragments=2, MaxWords=20, MinWords=8"
+)
+
+
+def highlight(headline: str):
+    return (
+        html.escape(headline).replace(START_SEL, "<mark>").replace(STOP_SEL, "</mark>")
+    )
+
+
+def parse_search_cursor(value) -> tuple[float, str, UUID]:
+    rank, type, id = value
+    return float(rank), str(type), UUID(id)
+
+
+async def search(
+    q: str,
+    type: Literal["survey", "event"] | None,
+    limit: int,
+    user: User,
+    db_session: AsyncSession,
+    cursor: str | None = None,
+):
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    survey, event = Survey.__table__, Event.__table__
+    sources = []
+    if type in (None, "survey"):
+        surveys = select(
+            literal("survey").label("type"),
+            survey.c.id,
+            survey.c.title,
+            survey.c.description.label("body"),
+            func.ts_rank_cd(survey.c.search_vector, query).label("rank"),
+        ).where(survey.c.search_vector.op("@@")(query))
+        if not user.account_type == "admin":
+            surveys = surveys.where(survey.c.active)
+        sources.append(surveys)
+    if type in (None, "event"):
+        sources.append(
+            select(
+                literal("event").label("type"),
+                event.c.id,
+                event.c.title,
+                func.concat_ws(" - ", event.c.location, event.c.description).label(
+                    "body"
+                ),
+                func.ts_rank_cd(event.c.search_vector, query).label("rank"),
+            ).where(event.c.search_vector.op("@@")(query))
+        )
+    matches = union_all(*sources).subquery("matches")
+    order = (matches.c.rank.desc(), matches.c.type, matches.c.id)
+    page_stmt = select(matches).order_by(*order).limit(limit + 1)
+    if cursor:
+        rank, last_type, last_id = decode_cursor(cursor, parse_search_cursor)
+        page_stmt = page_stmt.where(
+            tuple_(-matches.c.rank, matches.c.type, matches.c.id)
+            > tuple_(-rank, last_type, last_id)
+        )
+    # Headlines are only built for the rows of the page, not for every match.
+    ranked = page_stmt.subquery("ranked")
+    stmt = select(
+        ranked.c.type,
+        ranked.c.id,
+        ranked.c.rank,
+        func.ts_headline(SEARCH_CONFIG, ranked.c.title, query, TITLE_OPTIONS),
+        func.ts_headline(SEARCH_CONFIG, ranked.c.body, query, SNIPPET_OPTIONS),
+    ).order_by(ranked.c.rank.desc(), ranked.c.type, ranked.c.id)
+    # A term found in a large share of the rows makes Postgres rank every
+    # match; give up on those early rather than hold a connection until the
+    # global statement timeout.
+    await db_session.exec(
+        select(
+            func.set_config("statement_timeout", str(SEARCH_STATEMENT_TIMEOUT_MS), True)
+        )
+    )
+    try:
+        rows = (await db_session.exec(stmt)).all()
+    except DBAPIError as e:
+        if getattr(e.orig, "sqlstate", None) != QUERY_CANCELED:
+            raise
+        await db_session.rollback()
+        raise HTTPException(
+            status_code=400, detail="Search is too broad, add more specific terms"
+        )
+    page, next_cursor = split_page(
+        rows, limit, lambda row: [row[2], row[0], str(row[1])]
+    )
+    return FastJSONResponse(
+        Page(
+            items=[
+                SearchResultSchema(
+                    type=kind,
+                    id=str(id),
+                    rank=rank,
+                    title=highlight(title),
+                    snippet=highlight(snippet),
+                )
+                for kind, id, rank, title, snippet in page
+            ],
+            next_cursor=next_cursor,
+        )
+    )
@@ -0,0 +1,186 @@
+import asyncio
+from collections import Counter
+from uuid import UUID
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, delete, func, select, true
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.database import async_session_maker
+from app.db.models import (
+    Survey,
+    SurveyAnswerCount,
+    SurveyQuestion,
+    SurveyResponse,
+    User,
+)
+from app.env import LIVE_RESULTS_CHANNEL, LIVE_RESULTS_HEARTBEAT_SECONDS
+from app.routes.schemas.survey_schemas import SurveyQuestionResultSchema
+from app.services.live_results import live_results
+
+COUNTED_QUESTION_TYPES = ("select", "multiselect")
+
+
+def answer_frequencies_stmt(survey_id: UUID):
+    answers = func.unnest(SurveyResponse.values).table_valued("value").render_derived()
+    return (
+        select(
+            SurveyResponse.survey_id,
+            SurveyResponse.question_id,
+            answers.c.value,
+            func.count(),
+        )
+        .join(SurveyQuestion, col(SurveyQuestion.id) == SurveyResponse.question_id)
+        .join(answers, true())
+        .where(
+            SurveyResponse.survey_id == survey_id,
+            col(SurveyQuestion.question_type).in_(COUNTED_QUESTION_TYPES),
+        )
+        .group_by(SurveyResponse.survey_id, SurveyResponse.question_id, answers.c.value)
+    )
+
+
+def answer_counts_stmt(survey_id: UUID):
+    # The maintained counterpart of answer_frequencies_stmt, same columns.
+    return select(
+        SurveyAnswerCount.survey_id,
+        SurveyAnswerCount.question_id,
+        SurveyAnswerCount.value,
+        SurveyAnswerCount.count,
+    ).where(SurveyAnswerCount.survey_id == survey_id)
+
+
+async def adjust_answer_counts(
+    survey_id: UUID,
+    answers: list[tuple[UUID, list[str] | None]],
+    delta: int,
+    db_session: AsyncSession,
+):
+    rows = [
+        {
+            "survey_id": survey_id,
+            "question_id": question_id,
+            "value": value,
+            "count": occurrences * delta,
+        }
+        for question_id, values in answers
+        for value, occurrences in Counter(values or []).items()
+    ]
+    if not rows:
+        return
+    stmt = insert(SurveyAnswerCount).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SurveyAnswerCount.question_id, SurveyAnswerCount.value],
+        set_={"count": SurveyAnswerCount.count + stmt.excluded.count},
+    )
+    await db_session.exec(stmt)
+    if delta < 0:
+        await db_session.exec(
+            delete(SurveyAnswerCount).where(
+                col(SurveyAnswerCount.question_id).in_(
+                    {question_id for question_id, _ in answers}
+                ),
+                col(SurveyAnswerCount.count) <= 0,
+            )
+        )
+
+
+async def rebuild_answer_counts(survey: Survey, db_session: AsyncSession):
+    await db_session.exec(
+        delete(SurveyAnswerCount).where(SurveyAnswerCount.survey_id == survey.id)
+    )
+    if not survey.active:
+        return
+    await db_session.exec(
+        insert(SurveyAnswerCount).from_select(
+            ["survey_id", "question_id", "value", "count"],
+            answer_frequencies_stmt(survey.id),
+        )
+    )
+
+
+async def get_survey_results(survey_id: UUID, user: User, db_session: AsyncSession):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return await load_survey_results(survey_id, db_session)
+
+
+async def load_survey_results(survey_id: UUID, db_session: AsyncSession):
+    survey = await db_session.get(Survey, survey_id)
+    if not survey:
+        raise HTTPException(status_code=404, detail="Survey not found")
+    stmt = select(
+        SurveyQuestion.id, SurveyQuestion.title, SurveyQuestion.question_type
+    ).where(
+        SurveyQuestion.survey_id == survey_id,
+        col(SurveyQuestion.question_type).in_(COUNTED_QUESTION_TYPES),
+    )
+    results = {
+        question_id: SurveyQuestionResultSchema(
+            question_id=question_id,
+            title=title,
+            question_type=question_type,
+            answers={},
+        )
+        for question_id, title, question_type in (await db_session.exec(stmt)).all()
+    }
+    if survey.active:
+        counts_stmt = answer_counts_stmt(survey_id)
+    else:
+        counts_stmt = answer_frequencies_stmt(survey_id)
+    for _, question_id, value, count in (await db_session.exec(counts_stmt)).all():
+        if question_id in results:
+            results[question_id].answers[value] = count
+    return list(results.values())
+
+
+async def notify_survey_results(survey_id: UUID, db_session: AsyncSession):
+    """Tell live result streams in every worker that the tallies of a survey
+    changed. Postgres only delivers the notification if the surrounding
+    transaction commits, and folds repeats within it into one."""
+    await db_session.exec(select(func.pg_notify(LIVE_RESULTS_CHANNEL, str(survey_id))))
+
+
+async def load_live_survey_results(key: str):
+    # The notification was sent on commit to the primary; a replica may not
+    # have replayed the change yet.
+    async with async_session_maker() as db_session:
+        results = await load_survey_results(UUID(key), db_session)
+    return to_json(results).decode()
+
+
+def server_sent_event(payload: str):
+    return f"event: results\ndata: {payload}\n\n"
+
+
+async def stream_survey_results(survey_id: UUID, user: User, db_session: AsyncSession):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if not await db_session.get(Survey, survey_id):
+        raise HTTPException(status_code=404, detail="Survey not found")
+
+    async def events():
+        key = str(survey_id)
+        # Subscribe before taking the first snapshot so no change falls
+        # between the two.
+        async with live_results.subscribe(key, load_live_survey_results) as queue:
+            yield server_sent_event(await load_live_survey_results(key))
+            while True:
+                try:
+                    payload = await asyncio.wait_for(
+                        queue.get(), LIVE_RESULTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Keeps idle proxies from closing the connection.
+                    yield ": keep-alive\n\n"
+                    continue
+                yield server_sent_event(payload)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,58 +1,183 @@
-from uuid import UUID
+import csv
+import io
+import json
+from typing import Awaitable, Callable, Literal
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
-from sqlmodel import Session, select
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db.models import Survey, SurveyQuestion, SurveyResponse, User
+from app.db.replica import read_session_maker
+from app.env import EXPORT_BATCH_SIZE
+from app.routes.schemas.pagination_schemas import Page
 from app.routes.schemas.survey_schemas import (
+    NestedSurveyQuestionSchema,
     SurveyQuestionSchema,
     SurveyResponseSchema,
     SurveySchema,
+    SurveySubmissionSchema,
+    SurveyWithQuestionsSchema,
+    check_answers,
 )
+from app.routes.schemas.user_schemas import UserSchema
+from app.routes.services.survey_results_service import (
+    COUNTED_QUESTION_TYPES,
+    adjust_answer_counts,
+    notify_survey_results,
+    rebuild_answer_counts,
+)
+from app.services.cache import (
+    read_model_cache,
+    survey_cache_key,
+    survey_questions_cache_key,
+)
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.utils.pagination import decode_cursor, split_page
+from app.utils.responses import FastJSONResponse
+
+
+def surveys_stmt(active_only: bool, after: UUID | None = None):
+    stmt = select(Survey).options(selectinload(Survey.author)).order_by(col(Survey.id))
+    if active_only:
+        stmt = stmt.where(Survey.active)
+    if after is not None:
+        stmt = stmt.where(col(Survey.id) > after)
+    return stmt
+
+
+async def list_surveys(
+    active_only: bool,
+    offset: int | None,
+    cursor: str | None,
+    limit: int,
+    db_session: AsyncSession,
+):
+    if offset is not None:
+        stmt = surveys_stmt(active_only).offset(offset).limit(limit)
+        surveys_in_db = await db_session.exec(stmt)
+        return FastJSONResponse(
+            [SurveySchema.from_model(survey) for survey in surveys_in_db.all()]
+        )
+    after = decode_cursor(cursor, UUID) if cursor else None
+    stmt = surveys_stmt(active_only, after).limit(limit + 1)
+    surveys_in_db = (await db_session.exec(stmt)).all()
+    page, next_cursor = split_page(surveys_in_db, limit, lambda survey: survey.id)
+    return FastJSONResponse(
+        Page(
+            items=[SurveySchema.from_model(survey) for survey in page],
+            next_cursor=next_cursor,
+        )
+    )
 
 
-def get_all_active_surveys(
-    offset: int,
+async def get_all_active_surveys(
+    offset: int | None,
     limit: int,
     user: User,
-    db_session: Session,
+    db_session: AsyncSession,
+    cursor: str | None = None,
 ):
     if not user.account_type == "admin":
         raise HTTPException(status_code=403, detail="Forbidden")
-    stmt = select(Survey).where(Survey.active).offset(offset).limit(limit)
-    active_surveys_in_db = db_session.exec(stmt)
-    active_surveys = [
-        SurveySchema.from_model(survey) for survey in active_surveys_in_db.all()
-    ]
-    return active_surveys
+    return await list_surveys(True, offset, cursor, limit, db_session)
 
 
-def get_all_surveys(
-    offset: int,
+async def get_all_surveys(
+    offset: int | None,
     limit: int,
     user: User,
-    db_session: Session,
+    db_session: AsyncSession,
+    cursor: str | None = None,
 ):
     if not user.account_type == "admin":
         raise HTTPException(status_code=403, detail="Forbidden")
-    stmt = select(Survey).offset(offset).limit(limit)
-    surveys_in_db = db_session.exec(stmt)
-    surveys = [SurveySchema.from_model(survey) for survey in surveys_in_db.all()]
-    return surveys
+    return await list_surveys(False, offset, cursor, limit, db_session)
+
+
+async def get_survey_version(survey_id: UUID, db_session: AsyncSession):
+    stmt = select(Survey.version).where(Survey.id == survey_id)
+    version = (await db_session.exec(stmt)).first()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Survey not found")
+    return version
+
 
+async def bump_survey_version(survey_id: UUID, db_session: AsyncSession):
+    await db_session.exec(
+        update(Survey)
+        .where(col(Survey.id) == survey_id)
+        .values(version=col(Survey.version) + 1)
+    )
+
+
+async def invalidate_survey_read_models(survey_id: UUID):
+    await read_model_cache.invalidate(
+        survey_cache_key(survey_id), survey_questions_cache_key(survey_id)
+    )
+
+
+def read_model_response(cached: str, if_none_match: str | None):
+    # Cached read models are stored as "<etag>\n<json body>".
+    etag, body = cached.split("\n", 1)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return Response(
+        content=body, media_type="application/json", headers=etag_headers(etag)
+    )
 
-def get_survey(id: UUID, db_session: Session, user: User):
-    survey = db_session.get(Survey, id)
+
+async def get_read_model(
+    key: str,
+    loader: Callable[[], Awaitable[str]],
+    current_etag: Callable[[], Awaitable[str]],
+    if_none_match: str | None,
+):
+    if if_none_match:
+        # A cached copy carries its ETag, so a revalidation it can answer
+        # never reaches the database; otherwise the version alone settles it
+        # before a full load.
+        cached = await read_model_cache.get(key)
+        if cached is not None:
+            return read_model_response(cached, if_none_match)
+        etag = await current_etag()
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    cached = await read_model_cache.get_or_load(key, loader)
+    return read_model_response(cached, if_none_match)
+
+
+async def load_survey_read_model(id: UUID, db_session: AsyncSession):
+    survey = await db_session.get(Survey, id, options=[joinedload(Survey.author)])
     if not survey:
         raise HTTPException(status_code=404, detail="Survey not found")
-    survey_response = SurveySchema.from_model(survey)
-    return survey_response
+    etag = make_etag(survey.id, survey.version)
+    return f"{etag}\n{SurveySchema.from_model(survey).model_dump_json()}"
 
 
-def add_survey(
+async def get_survey(
+    id: UUID, db_session: AsyncSession, user: User, if_none_match: str | None = None
+):
+    async def current_etag():
+        return make_etag(id, await get_survey_version(id, db_session))
+
+    return await get_read_model(
+        survey_cache_key(id),
+        lambda: load_survey_read_model(id, db_session),
+        current_etag,
+        if_none_match,
+    )
+
+
+async def add_survey(
     survey: SurveySchema,
-    db_session: Session,
+    db_session: AsyncSession,
     user: User,
 ):
     db_survey = Survey(
@@ -62,55 +187,112 @@ def add_survey(
         active=survey.active,
     )
     db_session.add(db_survey)
-    db_session.commit()
-    db_session.refresh(db_survey)
+    await db_session.commit()
+    await db_session.refresh(db_survey)
+    await db_survey.awaitable_attrs.author
     response = SurveySchema.from_model(db_survey)
     return response
 
 
-def update_survey(
-    survey: SurveySchema,
-    db_session: Session,
+async def add_survey_with_questions(
+    survey: SurveyWithQuestionsSchema,
+    db_session: AsyncSession,
     user: User,
 ):
-    survey_in_db = db_session.get(Survey, UUID(survey.id))
-
-    if not survey_in_db:
-        raise HTTPException(status_code=404, detail="Survey not found")
-
-    db_survey = Survey(
-        id=UUID(survey.id),
-        author_email=user.email,
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    survey_id = uuid4()
+    questions = [
+        NestedSurveyQuestionSchema(
+            id=str(uuid4()), title=question.title, question_type=question.question_type
+        )
+        for question in survey.questions
+    ]
+    await db_session.exec(
+        insert(Survey).values(
+            id=survey_id,
+            author_email=user.email,
+            title=survey.title,
+            description=survey.description,
+            active=survey.active,
+        )
+    )
+    if questions:
+        await db_session.exec(
+            insert(SurveyQuestion).values(
+                [
+                    {
+                        "id": UUID(question.id),
+                        "survey_id": survey_id,
+                        "author_email": user.email,
+                        "title": question.title,
+                        "question_type": question.question_type,
+                    }
+                    for question in questions
+                ]
+            )
+        )
+    await db_session.commit()
+    return SurveyWithQuestionsSchema(
+        id=str(survey_id),
         title=survey.title,
         description=survey.description,
         active=survey.active,
+        author=UserSchema.from_model(user),
+        questions=questions,
     )
-    db_session.add(db_survey)
-    db_session.commit()
-    db_session.refresh(db_survey)
-    return SurveySchema.from_model(db_survey)
 
 
-def delete_survey(id: UUID, user: User, db_session: Session):
+async def update_survey(
+    survey: SurveySchema,
+    db_session: AsyncSession,
+    user: User,
+):
+    survey_in_db = await db_session.get(Survey, UUID(survey.id))
+
+    if not survey_in_db:
+        raise HTTPException(status_code=404, detail="Survey not found")
+
+    activation_changed = survey_in_db.active != survey.active
+    survey_in_db.author_email = user.email
+    survey_in_db.title = survey.title
+    survey_in_db.description = survey.description
+    survey_in_db.active = survey.active
+    db_session.add(survey_in_db)
+    await bump_survey_version(survey_in_db.id, db_session)
+    if activation_changed:
+        await rebuild_answer_counts(survey_in_db, db_session)
+    await db_session.commit()
+    await invalidate_survey_read_models(survey_in_db.id)
+    await db_session.refresh(survey_in_db)
+    await survey_in_db.awaitable_attrs.author
+    return SurveySchema.from_model(survey_in_db)
+
+
+async def delete_survey(id: UUID, user: User, db_session: AsyncSession):
     if not user.account_type == "admin":
         raise HTTPException(status_code=403, detail="Forbidden")
-    survey = db_session.get(Survey, id)
+    survey = await db_session.get(Survey, id)
     if not survey:
         raise HTTPException(status_code=404, detail="Survey not found")
-    db_session.delete(survey)
-    db_session.commit()
+    await db_session.delete(survey)
+    await db_session.commit()
+    await invalidate_survey_read_models(id)
     return JSONResponse(
         content={"message": "Survey deleted successfully"}, status_code=200
     )
 
 
-def add_survey_question(
-    survey_id: UUID, question: SurveyQuestionSchema, user: User, db_session: Session
+async def add_survey_question(
+    survey_id: UUID,
+    question: SurveyQuestionSchema,
+    user: User,
+    db_session: AsyncSession,
 ):
     if not user.account_type == "admin":
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    survey = db_session.get(Survey, survey_id)
+    survey = await db_session.get(Survey, survey_id)
 
     if not survey:
         raise HTTPException(status_code=404, detail="Survey not found")
@@ -118,15 +300,18 @@ def add_survey_question(
     db_question: SurveyQuestion = question.to_model()
     db_question.survey_id = survey_id
     db_session.add(db_question)
-    db_session.commit()
-    db_session.refresh(db_question)
+    await bump_survey_version(survey_id, db_session)
+    await db_session.commit()
+    await invalidate_survey_read_models(survey_id)
+    await db_session.refresh(db_question)
+    await db_question.awaitable_attrs.author
     return SurveyQuestionSchema.from_model(db_question)
 
 
-def update_survey_question(
+async def update_survey_question(
     question: SurveyQuestionSchema,
     user: User,
-    db_session: Session,
+    db_session: AsyncSession,
 ):
     if not user.account_type == "admin":
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -134,128 +319,328 @@ def update_survey_question(
     if question.id is None:
         raise ValueError("Question ID is required")
 
-    db_question = db_session.get(SurveyQuestion, UUID(question.id))
+    db_question = await db_session.get(SurveyQuestion, UUID(question.id))
     if not db_question:
         raise HTTPException(status_code=404, detail="Question not found")
-    db_session.add(question.to_model())
-    db_session.commit()
+    db_question.title = question.title
+    db_question.question_type = question.question_type
+    db_question.author_email = question.author.email
+    db_session.add(db_question)
+    await bump_survey_version(db_question.survey_id, db_session)
+    await db_session.commit()
+    await invalidate_survey_read_models(db_question.survey_id)
+    await db_session.refresh(db_question)
+    await db_question.awaitable_attrs.author
     return SurveyQuestionSchema.from_model(db_question)
 
 
-def delete_survey_question(
+async def delete_survey_question(
     question_id: UUID,
-    db_session: Session,
+    db_session: AsyncSession,
     user: User,
 ):
     if not user.account_type == "admin":
         raise HTTPException(status_code=403, detail="Forbidden")
-    db_question = db_session.get(SurveyQuestion, question_id)
+    db_question = await db_session.get(SurveyQuestion, question_id)
     if not db_question:
         raise HTTPException(status_code=404, detail="Question not found")
-    db_session.delete(db_question)
-    db_session.commit()
+    await db_session.delete(db_question)
+    await bump_survey_version(db_question.survey_id, db_session)
+    await db_session.commit()
+    await invalidate_survey_read_models(db_question.survey_id)
     return JSONResponse(
         content={"message": "Question deleted successfully"}, status_code=200
     )
 
 
-def get_survey_questions(
+def survey_questions_stmt(survey_id: UUID):
+    return (
+        select(SurveyQuestion)
+        .where(SurveyQuestion.survey_id == survey_id)
+        .options(selectinload(SurveyQuestion.author))
+    )
+
+
+async def load_survey_questions_read_model(survey_id: UUID, db_session: AsyncSession):
+    version = await get_survey_version(survey_id, db_session)
+    questions = (await db_session.exec(survey_questions_stmt(survey_id))).all()
+    body = to_json(
+        [SurveyQuestionSchema.from_model(question) for question in questions]
+    ).decode()
+    return f"{make_etag(survey_id, version, 'questions')}\n{body}"
+
+
+async def get_survey_questions(
     survey_id: UUID,
     user: User,
-    db_session: Session,
+    db_session: AsyncSession,
+    if_none_match: str | None = None,
 ):
-    survey = db_session.get(Survey, survey_id)
-    if not survey:
-        raise HTTPException(status_code=404, detail="Survey not found")
-    questions = survey.questions
-    response = [SurveyQuestionSchema.from_model(question) for question in questions]
-    return response
+    async def current_etag():
+        version = await get_survey_version(survey_id, db_session)
+        return make_etag(survey_id, version, "questions")
+
+    return await get_read_model(
+        survey_questions_cache_key(survey_id),
+        lambda: load_survey_questions_read_model(survey_id, db_session),
+        current_etag,
+        if_none_match,
+    )
 
 
-def add_survey_response(
+async def add_survey_response(
     survey_id: UUID,
     question_id: UUID,
     response: SurveyResponseSchema,
     user: User,
-    db_session: Session,
+    db_session: AsyncSession,
 ):
     if not user.email == response.responder_email:
         raise HTTPException(status_code=403, detail="Forbidden")
-    survey = db_session.get(Survey, survey_id)
+    survey = await db_session.get(Survey, survey_id)
     if not survey:
         raise HTTPException(status_code=404, detail="Survey not found")
-    question = db_session.get(SurveyQuestion, question_id)
-    if not question:
+    question = await db_session.get(SurveyQuestion, question_id)
+    if not question or not question.survey_id == survey_id:
         raise HTTPException(status_code=404, detail="Question not found")
+    if not (response.survey_id, response.question_id) == (survey_id, question_id):
+        raise HTTPException(
+            status_code=400, detail="Survey and question ids must match the path"
+        )
+    # response_type comes from the client; check against the question itself.
+    error = check_answers(question.question_type, response.answers)
+    if error:
+        raise HTTPException(status_code=422, detail=error)
     db_response = response.to_model()
     db_session.add(db_response)
-    db_session.commit()
+    try:
+        await db_session.flush()
+    except IntegrityError:
+        # The responder already answered this question.
+        await db_session.rollback()
+        raise HTTPException(status_code=409, detail="Question already answered")
+    if survey.active and question.question_type in COUNTED_QUESTION_TYPES:
+        await adjust_answer_counts(
+            survey_id, [(question_id, db_response.values)], 1, db_session
+        )
+    await notify_survey_results(survey_id, db_session)
+    await db_session.commit()
+    await db_response.awaitable_attrs.question
     resp = SurveyResponseSchema.from_model(db_response)
     return resp
 
 
-def change_survey_response(
+def answered_questions_stmt(responder_email: str, question_ids: list[UUID]):
+    return select(SurveyResponse.question_id).where(
+        SurveyResponse.responder_email == responder_email,
+        col(SurveyResponse.question_id).in_(question_ids),
+    )
+
+
+async def submit_survey_responses(
+    survey_id: UUID,
+    submission: SurveySubmissionSchema,
+    user: User,
+    db_session: AsyncSession,
+):
+    survey = await db_session.get(Survey, survey_id)
+    if not survey:
+        raise HTTPException(status_code=404, detail="Survey not found")
+    question_ids = [answer.question_id for answer in submission.answers]
+    stmt = select(SurveyQuestion).where(
+        SurveyQuestion.survey_id == survey_id,
+        col(SurveyQuestion.id).in_(question_ids),
+    )
+    questions = {
+        question.id: question for question in (await db_session.exec(stmt)).all()
+    }
+    answered_stmt = answered_questions_stmt(user.email, question_ids)
+    answered = set((await db_session.exec(answered_stmt)).all())
+
+    errors = []
+    seen: set[UUID] = set()
+    for answer in submission.answers:
+        question = questions.get(answer.question_id)
+        if not question:
+            error = "Question not found"
+        elif answer.question_id in seen:
+            error = "Question answered more than once"
+        elif answer.question_id in answered:
+            error = "Question already answered"
+        else:
+            error = check_answers(question.question_type, answer.answers)
+        seen.add(answer.question_id)
+        if error:
+            errors.append({"question_id": str(answer.question_id), "error": error})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    if not submission.answers:
+        return []
+
+    rows = [
+        {
+            "id": uuid4(),
+            "survey_id": survey_id,
+            "question_id": answer.question_id,
+            "responder_email": user.email,
+            "values": answer.answers,
+        }
+        for answer in submission.answers
+    ]
+    try:
+        await db_session.exec(insert(SurveyResponse).values(rows))
+    except IntegrityError:
+        # A concurrent submission answered one of these questions first.
+        await db_session.rollback()
+        raise HTTPException(status_code=409, detail="Survey already answered")
+    if survey.active:
+        await adjust_answer_counts(
+            survey_id,
+            [
+                (answer.question_id, answer.answers)
+                for answer in submission.answers
+                if questions[answer.question_id].question_type in COUNTED_QUESTION_TYPES
+            ],
+            1,
+            db_session,
+        )
+    await notify_survey_results(survey_id, db_session)
+    await db_session.commit()
+    return [
+        SurveyResponseSchema(
+            id=row["id"],
+            survey_id=survey_id,
+            question_id=row["question_id"],
+            answers=row["values"],
+            response_type=questions[row["question_id"]].question_type,
+            responder_email=user.email,
+        )
+        for row in rows
+    ]
+
+
+async def change_survey_response(
     survey_id: UUID,
     question_id: UUID,
     response: SurveyResponseSchema,
     user: User,
-    db_session: Session,
+    db_session: AsyncSession,
 ):
     if not response.id:
         raise HTTPException(status_code=404, detail="Response id must be provided")
-    if not user.email == response.responder_email:
-        raise HTTPException(status_code=403, detail="Forbidden")
-    survey = db_session.get(Survey, survey_id)
+    survey = await db_session.get(Survey, survey_id)
     if not survey:
         raise HTTPException(status_code=404, detail="Survey not found")
-    question = db_session.get(SurveyQuestion, question_id)
-    if not question:
+    question = await db_session.get(SurveyQuestion, question_id)
+    if not question or not question.survey_id == survey_id:
         raise HTTPException(status_code=404, detail="Question not found")
-    db_response = db_session.get(SurveyResponse, response.id)
-    if not db_response:
+    db_response = await db_session.get(SurveyResponse, response.id)
+    if not db_response or not db_response.question_id == question_id:
         raise HTTPException(status_code=404, detail="Response not found")
+    # The stored responder is what counts, not the email sent in the body.
+    if not user.email == db_response.responder_email:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    # response_type comes from the client; check against the question itself.
+    error = check_answers(question.question_type, response.answers)
+    if error:
+        raise HTTPException(status_code=422, detail=error)
+    if survey.active and question.question_type in COUNTED_QUESTION_TYPES:
+        await adjust_answer_counts(
+            db_response.survey_id,
+            [(db_response.question_id, db_response.values)],
+            -1,
+            db_session,
+        )
+        await adjust_answer_counts(
+            db_response.survey_id,
+            [(db_response.question_id, response.answers)],
+            1,
+            db_session,
+        )
+    db_response.values = response.answers
     db_session.add(db_response)
-    db_session.commit()
+    await notify_survey_results(db_response.survey_id, db_session)
+    await db_session.commit()
+    await db_response.awaitable_attrs.question
     resp = SurveyResponseSchema.from_model(db_response)
     return resp
 
 
-def delete_survey_response(user: User, db_session: Session, response_id: UUID):
-    db_response = db_session.get(SurveyResponse, response_id)
+async def delete_survey_response(
+    user: User, db_session: AsyncSession, response_id: UUID
+):
+    db_response = await db_session.get(SurveyResponse, response_id)
     if not db_response:
         raise HTTPException(status_code=404, detail="Response not found")
     if not user.email == db_response.responder_email:
         raise HTTPException(status_code=403, detail="Forbidden")
-    db_session.delete(db_session)
-    db_session.commit()
+    survey = await db_response.awaitable_attrs.survey
+    question = await db_response.awaitable_attrs.question
+    if survey.active and question.question_type in COUNTED_QUESTION_TYPES:
+        await adjust_answer_counts(
+            db_response.survey_id,
+            [(db_response.question_id, db_response.values)],
+            -1,
+            db_session,
+        )
+    await db_session.delete(db_response)
+    await notify_survey_results(db_response.survey_id, db_session)
+    await db_session.commit()
     return JSONResponse(
         content={"message": "Response deleted successfully"}, status_code=200
     )
 
 
-def get_survey_responses(
-    user: User, db_session: Session, survey_id: UUID, offset: int, limit: int
+def survey_responses_stmt(survey_id: UUID, after: UUID | None = None):
+    stmt = (
+        select(SurveyResponse)
+        .where(SurveyResponse.survey_id == survey_id)
+        .options(selectinload(SurveyResponse.question))
+        .order_by(col(SurveyResponse.id))
+    )
+    if after is not None:
+        stmt = stmt.where(col(SurveyResponse.id) > after)
+    return stmt
+
+
+async def get_survey_responses(
+    user: User,
+    db_session: AsyncSession,
+    survey_id: UUID,
+    offset: int | None,
+    limit: int,
+    cursor: str | None = None,
 ):
     if not user.account_type == "admin":
         raise HTTPException(status_code=403, detail="Forbidden")
-    db_survey = db_session.get(Survey, survey_id)
+    db_survey = await db_session.get(Survey, survey_id)
     if not db_survey:
         raise HTTPException(status_code=404, detail="Survey not found")
-    stmt = (
-        select(SurveyResponse)
-        .where(SurveyResponse.survey_id == survey_id)
-        .offset(offset)
-        .limit(limit)
+    if offset is not None:
+        stmt = survey_responses_stmt(survey_id).offset(offset).limit(limit)
+        responses = [
+            SurveyResponseSchema.from_model(response)
+            for response in (await db_session.exec(stmt))
+        ]
+        return FastJSONResponse(responses)
+    after = decode_cursor(cursor, UUID) if cursor else None
+    stmt = survey_responses_stmt(survey_id, after).limit(limit + 1)
+    responses_in_db = (await db_session.exec(stmt)).all()
+    page, next_cursor = split_page(responses_in_db, limit, lambda response: response.id)
+    return FastJSONResponse(
+        Page(
+            items=[SurveyResponseSchema.from_model(response) for response in page],
+            next_cursor=next_cursor,
+        )
     )
-    responses = [
-        SurveyResponseSchema.from_model(response)
-        for response in db_session.exec(stmt).all()
-    ]
-    return responses
 
 
-def get_survey_response(user: User, db_session: Session, response_id: UUID):
-    db_response = db_session.get(SurveyResponse, response_id)
+async def get_survey_response(user: User, db_session: AsyncSession, response_id: UUID):
+    db_response = await db_session.get(
+        SurveyResponse,
+        response_id,
+        options=[joinedload(SurveyResponse.question)],
+    )
     if not db_response:
         raise HTTPException(status_code=404, detail="Response not found")
     if (
@@ -265,3 +650,80 @@ def get_survey_response(user: User, db_session: Session, response_id: UUID):
         raise HTTPException(status_code=403, detail="Forbidden")
     response = SurveyResponseSchema.from_model(db_response)
     return response
+
+
+async def export_survey_responses(
+    user: User,
+    db_session: AsyncSession,
+    survey_id: UUID,
+    format: Literal["csv", "ndjson"],
+):
+    if not user.account_type == "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    db_survey = await db_session.get(Survey, survey_id)
+    if not db_survey:
+        raise HTTPException(status_code=404, detail="Survey not found")
+    stmt = select(
+        SurveyQuestion.id, SurveyQuestion.title, SurveyQuestion.question_type
+    ).where(SurveyQuestion.survey_id == survey_id)
+    questions = {
+        question_id: (title, question_type)
+        for question_id, title, question_type in (await db_session.exec(stmt)).all()
+    }
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_survey_responses(survey_id, questions, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{survey_id}.{format}"'},
+    )
+
+
+async def stream_survey_responses(
+    survey_id: UUID,
+    questions: dict[UUID, tuple[str, str]],
+    format: Literal["csv", "ndjson"],
+):
+    # The request's session is closed once the route returns, so the export
+    # holds its own session (and server-side cursor) for as long as it streams.
+    columns = [
+        "response_id",
+        "responder_email",
+        "question_id",
+        "question_title",
+        "question_type",
+        "answers",
+    ]
+    if format == "csv":
+        yield ",".join(columns) + "\r\n"
+    stmt = (
+        select(
+            SurveyResponse.id,
+            SurveyResponse.responder_email,
+            SurveyResponse.question_id,
+            SurveyResponse.values,
+        )
+        .where(SurveyResponse.survey_id == survey_id)
+        .order_by(col(SurveyResponse.id))
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    async with read_session_maker()() as db_session:
+        result = await db_session.stream(stmt)
+        async for partition in result.partitions():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for response_id, responder_email, question_id, values in partition:
+                title, question_type = questions.get(question_id, ("", ""))
+                row = [
+                    str(response_id),
+                    responder_email,
+                    str(question_id),
+                    title,
+                    question_type,
+                    values or [],
+                ]
+                if format == "csv":
+                    row[-1] = json.dumps(row[-1])
+                    writer.writerow(row)
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, row))) + "\n")
+            yield buffer.getvalue()
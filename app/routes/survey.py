@@ -1,31 +1,42 @@
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, Header, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.auth.auth_service import get_current_user
 from app.db.database import generate_database_session
 from app.db.models import User
+from app.db.replica import generate_read_database_session
+from app.env import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.routes.schemas.survey_schemas import (
     SurveyQuestionSchema,
     SurveyResponseSchema,
     SurveySchema,
+    SurveySubmissionSchema,
+    SurveyWithQuestionsSchema,
+)
+from app.routes.services.survey_results_service import (
+    get_survey_results,
+    stream_survey_results,
 )
 from app.routes.services.survey_service import (
     add_survey,
     add_survey_question,
     add_survey_response,
+    add_survey_with_questions,
     change_survey_response,
     delete_survey,
     delete_survey_question,
     delete_survey_response,
+    export_survey_responses,
     get_all_active_surveys,
     get_all_surveys,
     get_survey,
     get_survey_questions,
     get_survey_response,
     get_survey_responses,
+    submit_survey_responses,
     update_survey,
     update_survey_question,
 )
@@ -36,61 +47,82 @@ survey_router = APIRouter()
 @survey_router.get("/surveys")
 async def get_surveys(
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
-    offset: int = 0,
-    limit: int = Query(default=10, le=10),
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+    cursor: str | None = None,
+    offset: int | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     active: bool = True,
 ):
     if active:
-        return get_all_active_surveys(
-            offset=offset, limit=limit, user=user, db_session=db_session
+        return await get_all_active_surveys(
+            offset=offset, limit=limit, user=user, db_session=db_session, cursor=cursor
         )
-    return get_all_surveys(offset=offset, limit=limit, user=user, db_session=db_session)
+    return await get_all_surveys(
+        offset=offset, limit=limit, user=user, db_session=db_session, cursor=cursor
+    )
 
 
 @survey_router.get("/surveys/{survey_id}")
 async def gt_survey(
     survey_id: str,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    return get_survey(UUID(survey_id), db_session=db_session, user=user)
+    return await get_survey(
+        UUID(survey_id), db_session=db_session, user=user, if_none_match=if_none_match
+    )
 
 
 @survey_router.post("/survey/create", status_code=201)
 async def create_survey(
     survey: SurveySchema,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
 ):
-    return add_survey(survey, user=user, db_session=db_session)
+    return await add_survey(survey, user=user, db_session=db_session)
+
+
+@survey_router.post("/survey/create/nested", status_code=201)
+async def create_survey_with_questions(
+    survey: SurveyWithQuestionsSchema,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    return await add_survey_with_questions(survey, user=user, db_session=db_session)
 
 
 @survey_router.put("/survey/edit", status_code=201)
 async def upd_survey(
     survey: SurveySchema,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
 ):
-    return update_survey(survey, user=user, db_session=db_session)
+    return await update_survey(survey, user=user, db_session=db_session)
 
 
 @survey_router.delete("/surveys/delete/{survey_id}", status_code=204)
 async def del_survey(
     survey_id: str,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
 ):
-    return delete_survey(UUID(survey_id), user=user, db_session=db_session)
+    return await delete_survey(UUID(survey_id), user=user, db_session=db_session)
 
 
 @survey_router.get("/surveys/{survey_id}/questions")
 async def gt_survey_questions(
     survey_id: str,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    return get_survey_questions(UUID(survey_id), user=user, db_session=db_session)
+    return await get_survey_questions(
+        UUID(survey_id),
+        user=user,
+        db_session=db_session,
+        if_none_match=if_none_match,
+    )
 
 
 @survey_router.post("/surveys/{survey_id}/questions/create", status_code=201)
@@ -98,9 +130,9 @@ async def create_survey_question(
     survey_id: str,
     question: SurveyQuestionSchema,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
 ):
-    return add_survey_question(
+    return await add_survey_question(
         survey_id=UUID(survey_id), question=question, user=user, db_session=db_session
     )
 
@@ -109,27 +141,27 @@ async def create_survey_question(
 async def upd_survey_question(
     question: SurveyQuestionSchema,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
 ):
-    return update_survey_question(question, user=user, db_session=db_session)
+    return await update_survey_question(question, user=user, db_session=db_session)
 
 
 @survey_router.delete("/survey/questions/delete", status_code=204)
 async def del_survey_question(
     question_id: UUID,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
 ):
-    return delete_survey_question(question_id, user=user, db_session=db_session)
+    return await delete_survey_question(question_id, user=user, db_session=db_session)
 
 
 @survey_router.get("/survey/response/{response_id}")
 async def gt_survey_response(
     response_id: UUID,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
 ):
-    return get_survey_response(
+    return await get_survey_response(
         user=user, db_session=db_session, response_id=response_id
     )
 
@@ -138,28 +170,60 @@ async def gt_survey_response(
 async def gt_survey_responses(
     survey_id: UUID,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
-    offset: int = 0,
-    limit: int = Query(default=10, le=10),
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+    cursor: str | None = None,
+    offset: int | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ):
-    return get_survey_responses(
+    return await get_survey_responses(
         survey_id=survey_id,
         user=user,
         db_session=db_session,
         offset=offset,
         limit=limit,
+        cursor=cursor,
     )
 
 
+@survey_router.get("/surveys/{survey_id}/responses/export")
+async def exp_survey_responses(
+    survey_id: UUID,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+    format: Literal["csv", "ndjson"] = "csv",
+):
+    return await export_survey_responses(
+        user=user, db_session=db_session, survey_id=survey_id, format=format
+    )
+
+
+@survey_router.get("/surveys/{survey_id}/results")
+async def gt_survey_results(
+    survey_id: UUID,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+):
+    return await get_survey_results(survey_id, user=user, db_session=db_session)
+
+
+@survey_router.get("/surveys/{survey_id}/results/stream")
+async def strm_survey_results(
+    survey_id: UUID,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_read_database_session)],
+):
+    return await stream_survey_results(survey_id, user=user, db_session=db_session)
+
+
 @survey_router.post("/surveys/{survey_id}/response", status_code=201)
 async def create_survey_response(
     survey_id: UUID,
     question_id: UUID,
     survey_response: SurveyResponseSchema,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
 ):
-    return add_survey_response(
+    return await add_survey_response(
         survey_id=survey_id,
         response=survey_response,
         user=user,
@@ -168,15 +232,30 @@ async def create_survey_response(
     )
 
 
+@survey_router.post("/surveys/{survey_id}/responses", status_code=201)
+async def create_survey_responses(
+    survey_id: UUID,
+    submission: SurveySubmissionSchema,
+    user: Annotated[User, Depends(get_current_user)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    return await submit_survey_responses(
+        survey_id=survey_id,
+        submission=submission,
+        user=user,
+        db_session=db_session,
+    )
+
+
 @survey_router.put("/survey/response/edit", status_code=201)
 async def upd_survey_response(
     survey_id: UUID,
     question_id: UUID,
     response: SurveyResponseSchema,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
 ):
-    return change_survey_response(
+    return await change_survey_response(
         survey_id=survey_id,
         question_id=question_id,
         response=response,
@@ -189,8 +268,8 @@ async def upd_survey_response(
 async def del_survey_response(
     response_id: UUID,
     user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(generate_database_session)],
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
 ):
-    return delete_survey_response(
+    return await delete_survey_response(
         user=user, db_session=db_session, response_id=response_id
     )
@@ -0,0 +1,376 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Protocol
+
+from app.env import (
+    CACHE_BACKEND,
+    CACHE_INVALIDATION_CHANNEL,
+    DB_REPLICA_STRING,
+    READ_MODEL_CACHE_MAX_SIZE,
+    READ_MODEL_CACHE_TTL_SECONDS,
+    READ_MODEL_LOAD_LOCK_SECONDS,
+    READ_MODEL_LOCAL_MAX_SIZE,
+    READ_MODEL_LOCAL_TTL_SECONDS,
+    REDIS_URL,
+    REPLICA_MAX_LAG_SECONDS,
+)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str, ttl: float): ...
+
+    async def add(self, key: str, value: str, ttl: float) -> bool: ...
+
+    async def delete(self, *keys: str): ...
+
+    async def publish(self, message: str): ...
+
+    def subscribe(self) -> AsyncIterator[str]: ...
+
+    async def close(self): ...
+
+
+class MemoryCacheBackend:
+    """Process-local backend, for tests and single-worker deployments.
+
+    Holds at most `max_size` entries, evicting the least recently used.
+    """
+
+    def __init__(self, max_size: int = READ_MODEL_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._subscribers: set[asyncio.Queue[str]] = set()
+
+    async def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def add(self, key: str, value: str, ttl: float):
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def publish(self, message: str):
+        for queue in self._subscribers:
+            queue.put_nowait(message)
+
+    async def subscribe(self):
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        self._subscribers.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.discard(queue)
+
+    async def close(self):
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Backend for anything speaking the Redis protocol.
+
+    Takes an already built `redis.asyncio` compatible client, so tests can
+    pass in a `fakeredis.FakeAsyncRedis`.
+    """
+
+    def __init__(self, client, channel: str = CACHE_INVALIDATION_CHANNEL):
+        self._client = client
+        self.channel = channel
+
+    async def get(self, key: str):
+        value = await self._client.get(key)
+        if isinstance(value, bytes):
+            return value.decode()
+        return value
+
+    async def set(self, key: str, value: str, ttl: float):
+        await self._client.set(key, value, px=int(ttl * 1000))
+
+    async def add(self, key: str, value: str, ttl: float):
+        return bool(await self._client.set(key, value, px=int(ttl * 1000), nx=True))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._client.delete(*keys)
+
+    async def publish(self, message: str):
+        await self._client.publish(self.channel, message)
+
+    async def subscribe(self):
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                data = message["data"]
+                yield data.decode() if isinstance(data, bytes) else data
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.aclose()
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_cache_backend() -> CacheBackend:
+    if CACHE_BACKEND == "redis":
+        if not REDIS_URL:
+            raise ValueError("REDIS_URL must be set when CACHE_BACKEND is redis")
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise ValueError("CACHE_BACKEND=redis requires the redis package")
+        return RedisCacheBackend(redis.from_url(REDIS_URL))
+    return MemoryCacheBackend()
+
+
+class ReadModelCache:
+    """Two tier cache of serialized read models.
+
+    A short lived local tier, bounded to `local_max_size` entries, sits in
+    front of the shared backend. Concurrent misses for the same key share one
+    load: within a worker through a shared future, and across workers
+    through a lock key in the backend, whose holder loads while the others
+    wait for its result. Invalidations are published so every worker drops
+    its local copy.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float,
+        local_ttl: float,
+        redelete_delay: float = 1,
+        local_max_size: int = READ_MODEL_LOCAL_MAX_SIZE,
+        load_lock_ttl: float = READ_MODEL_LOAD_LOCK_SECONDS,
+        load_poll_interval: float = 0.05,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.redelete_delay = redelete_delay
+        self.local_max_size = local_max_size
+        self.load_lock_ttl = load_lock_ttl
+        self.load_poll_interval = load_poll_interval
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._loading: dict[str, asyncio.Future[str]] = {}
+        # Keys invalidated while this worker was loading them.
+        self._stale: set[str] = set()
+        self._pending: set[asyncio.Task] = set()
+
+    def _get_local(self, key: str):
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: str):
+        self._local[key] = (time.monotonic() + self.local_ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_size:
+            self._local.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, key: str):
+        """The cached value from either tier, or None; never loads it."""
+        value = self._get_local(key)
+        if value is None:
+            value = await self._backend_get(key)
+        if value is not None:
+            self.hits += 1
+        return value
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[str]]):
+        value = self._get_local(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        loading = self._loading.get(key)
+        if loading is not None:
+            self.hits += 1
+            return await asyncio.shield(loading)
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await self._backend_get(key)
+            if value is None:
+                value = await self._load_once(key, loader)
+            else:
+                self.hits += 1
+            # An invalidation that landed mid-load means `value` may already
+            # be stale, so hand it to the waiters but keep it out of both
+            # tiers.
+            if key not in self._stale:
+                self._set_local(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; mark the exception as retrieved.
+            future.exception()
+            raise
+        finally:
+            self._loading.pop(key, None)
+            self._stale.discard(key)
+
+    async def _load_once(self, key: str, loader: Callable[[], Awaitable[str]]):
+        # Workers that find the lock taken poll the shared tier for the
+        # holder's result, and take the lock over if the holder gives it up
+        # without storing one. Past `load_lock_ttl` they load regardless.
+        lock_key = f"{key}:loading"
+        locked = await self._backend_add(lock_key)
+        deadline = time.monotonic() + self.load_lock_ttl
+        while not locked and time.monotonic() < deadline:
+            await asyncio.sleep(self.load_poll_interval)
+            value = await self._backend_get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            locked = await self._backend_add(lock_key)
+        try:
+            self.misses += 1
+            self.loads += 1
+            value = await loader()
+            if key not in self._stale:
+                await self._backend_set(key, value)
+            return value
+        finally:
+            if locked:
+                await self._backend_delete(lock_key)
+
+    async def _backend_get(self, key: str):
+        # The shared tier is an optimisation; when it is unreachable reads
+        # fall through to the database instead of failing.
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            print(f"Error reading cached read model {key}: {e}")
+            return None
+
+    async def _backend_set(self, key: str, value: str):
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            print(f"Error caching read model {key}: {e}")
+
+    async def _backend_add(self, key: str):
+        # Without the backend every worker loads for itself.
+        try:
+            return await self.backend.add(key, "1", self.load_lock_ttl)
+        except Exception as e:
+            print(f"Error locking read model {key}: {e}")
+            return True
+
+    async def _backend_delete(self, key: str):
+        try:
+            await self.backend.delete(key)
+        except Exception as e:
+            print(f"Error unlocking read model {key}: {e}")
+
+    def _drop_local(self, keys: list[str]):
+        for key in keys:
+            self._local.pop(key, None)
+            if key in self._loading:
+                self._stale.add(key)
+
+    async def invalidate(self, *keys: str):
+        self._drop_local(list(keys))
+        try:
+            await self.backend.delete(*keys)
+            await self.backend.publish(json.dumps(keys))
+        except Exception as e:
+            print(f"Error invalidating cached read models {keys}: {e}")
+            return
+        # Another worker may have read the old rows just before our commit
+        # and still be about to store them, so delete once more after it has
+        # had time to finish.
+        task = asyncio.create_task(self._delete_later(keys))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _delete_later(self, keys: tuple[str, ...]):
+        await asyncio.sleep(self.redelete_delay)
+        try:
+            await self.backend.delete(*keys)
+        except Exception as e:
+            print(f"Error invalidating cached read models {keys}: {e}")
+
+    async def listen(self):
+        """Drop local copies whenever any worker publishes an invalidation."""
+        while True:
+            try:
+                async for message in self.backend.subscribe():
+                    self._drop_local(json.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Cache invalidation listener failed, resubscribing: {e}")
+                self._local.clear()
+                await asyncio.sleep(1)
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "local_size": len(self._local),
+            "local_max_size": self.local_max_size,
+            "loading": len(self._loading),
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
+
+
+def survey_cache_key(survey_id) -> str:
+    return f"survey:{survey_id}"
+
+
+def survey_questions_cache_key(survey_id) -> str:
+    return f"survey:{survey_id}:questions"
+
+
+read_model_cache = ReadModelCache(
+    create_cache_backend(),
+    ttl=READ_MODEL_CACHE_TTL_SECONDS,
+    local_ttl=READ_MODEL_LOCAL_TTL_SECONDS,
+    # Loads may read from a replica up to REPLICA_MAX_LAG_SECONDS behind, so
+    # the second delete has to come after any such stale load.
+    redelete_delay=REPLICA_MAX_LAG_SECONDS + 1 if DB_REPLICA_STRING else 1,
+)
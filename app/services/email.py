@@ -1,25 +1,199 @@
+import asyncio
 import smtplib
 import ssl
+from datetime import datetime, timedelta
 from email.message import EmailMessage
+from uuid import UUID
 
-from app.env import APP_EMAIL_ADDRESS, GOOGLE_APP_PASSWORD
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.db.models import OutboxEmail
+from app.env import (
+    APP_EMAIL_ADDRESS,
+    EMAIL_BATCH_SIZE,
+    EMAIL_MAX_ATTEMPTS,
+    EMAIL_POLL_SECONDS,
+    EMAIL_RETRY_BASE_SECONDS,
+    EMAIL_WORKERS,
+    SMTP_HOST,
+    SMTP_PASSWORD,
+    SMTP_PORT,
+    SMTP_USE_SSL,
+    SMTP_USERNAME,
+)
 
-def send_email(email: str, subject: str, message: str):
+
+def build_email_message(email: str, subject: str, message: str):
+    if not APP_EMAIL_ADDRESS:
+        raise ValueError("Origin email not set")
     email_message = EmailMessage()
     email_message["From"] = APP_EMAIL_ADDRESS
     email_message["To"] = email
     email_message["Subject"] = subject
     email_message.set_content(message)
-    ssl_context = ssl.create_default_context()
+    return email_message
+
+
+class SMTPConnection:
+    """A lazily opened SMTP connection that is reused across sends.
+
+    Methods block and are meant to be called from a worker thread.
+    """
 
-    if not APP_EMAIL_ADDRESS or not GOOGLE_APP_PASSWORD:
-        raise ValueError("Origin email and password not set")
+    def __init__(self):
+        self._server: smtplib.SMTP | None = None
 
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=ssl_context) as server:
-        server.login(APP_EMAIL_ADDRESS, GOOGLE_APP_PASSWORD)
+    def _connect(self):
+        if SMTP_USE_SSL:
+            server = smtplib.SMTP_SSL(
+                SMTP_HOST, SMTP_PORT, context=ssl.create_default_context()
+            )
+        else:
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+        if SMTP_USERNAME and SMTP_PASSWORD:
+            server.login(SMTP_USERNAME, SMTP_PASSWORD)
+        self._server = server
+        return server
+
+    def send(self, email_message: EmailMessage):
+        server = self._server or self._connect()
         try:
             server.send_message(email_message)
-        except Exception as e:
-            print(e)
-            raise ValueError("Email not sent")
+        except smtplib.SMTPServerDisconnected:
+            self._server = None
+            self._connect().send_message(email_message)
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except smtplib.SMTPException:
+            pass
+        self._server = None
+
+
+class EmailOutbox:
+    """Delivers queued `OutboxEmail` rows from a pool of background workers.
+
+    Each worker keeps its own authenticated SMTP connection open, drains up to
+    `batch_size` due emails at a time and retries failures with exponential
+    backoff until `max_attempts` is reached.
+
+    A batch stays locked until its outcome is committed and locked rows are
+    skipped, so several processes can share the outbox without sending an
+    email twice. `enqueue` only wakes a worker; emails queued by other
+    processes and retries that come due are found by polling every
+    `poll_seconds`.
+    """
+
+    def __init__(
+        self,
+        workers: int = EMAIL_WORKERS,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        max_attempts: int = EMAIL_MAX_ATTEMPTS,
+        retry_base_seconds: float = EMAIL_RETRY_BASE_SECONDS,
+        poll_seconds: float = EMAIL_POLL_SECONDS,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_seconds = poll_seconds
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._session_maker = None
+
+    def enqueue(self, email_id: UUID):
+        self._queue.put_nowait(email_id)
+
+    async def start(self, session_maker):
+        self._session_maker = session_maker
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self):
+        connection = SMTPConnection()
+        try:
+            while True:
+                try:
+                    delivered = await self._deliver(connection)
+                except Exception as e:
+                    print(f"Error delivering emails: {e}")
+                    delivered = 0
+                if delivered < self.batch_size:
+                    await self._wait()
+        finally:
+            await asyncio.to_thread(connection.close)
+
+    async def _wait(self):
+        try:
+            await asyncio.wait_for(self._queue.get(), self.poll_seconds)
+        except asyncio.TimeoutError:
+            return
+        # One batch covers several wake-ups.
+        for _ in range(self.batch_size - 1):
+            if self._queue.empty():
+                break
+            self._queue.get_nowait()
+
+    async def _deliver(self, connection: SMTPConnection):
+        assert self._session_maker is not None
+        async with self._session_maker() as db_session:
+            stmt = (
+                select(OutboxEmail)
+                .where(
+                    OutboxEmail.status == "pending",
+                    col(OutboxEmail.next_attempt_at) <= datetime.now(),
+                )
+                .order_by(col(OutboxEmail.next_attempt_at))
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            batch = (await db_session.exec(stmt)).all()
+            for outbox_email in batch:
+                outbox_email.attempts += 1
+                try:
+                    email_message = build_email_message(
+                        outbox_email.recipient,
+                        outbox_email.subject,
+                        outbox_email.message,
+                    )
+                    await asyncio.to_thread(connection.send, email_message)
+                except Exception as e:
+                    await asyncio.to_thread(connection.close)
+                    outbox_email.last_error = str(e)
+                    if outbox_email.attempts >= self.max_attempts:
+                        outbox_email.status = "failed"
+                    else:
+                        outbox_email.next_attempt_at = self._retry_at(
+                            outbox_email.attempts
+                        )
+                else:
+                    outbox_email.status = "sent"
+                    outbox_email.sent_at = datetime.now()
+                    outbox_email.last_error = None
+                db_session.add(outbox_email)
+            await db_session.commit()
+        return len(batch)
+
+    def _retry_at(self, attempts: int):
+        delay = self.retry_base_seconds * 2 ** (attempts - 1)
+        return datetime.now() + timedelta(seconds=delay)
+
+
+email_outbox = EmailOutbox()
+
+
+async def queue_email(email: str, subject: str, message: str, db_session: AsyncSession):
+    outbox_email = OutboxEmail(recipient=email, subject=subject, message=message)
+    db_session.add(outbox_email)
+    await db_session.commit()
+    email_outbox.enqueue(outbox_email.id)
+    return outbox_email
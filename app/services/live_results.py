@@ -0,0 +1,141 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+
+import asyncpg
+from sqlalchemy import make_url
+
+from app.env import DB_STRING, LIVE_RESULTS_CHANNEL, LIVE_RESULTS_MIN_INTERVAL_SECONDS
+
+Loader = Callable[[str], Awaitable[str]]
+
+
+class LiveResultsHub:
+    """Fans Postgres notifications out to the streams subscribed in this
+    worker.
+
+    A single LISTEN connection per worker receives a notification for every
+    committed change, whatever the number of subscribers. Notifications for a
+    key are coalesced: its loader runs at most once per `min_interval` and
+    each result is serialized once and handed to every subscriber, which only
+    ever holds the latest payload.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = LIVE_RESULTS_CHANNEL,
+        min_interval: float = LIVE_RESULTS_MIN_INTERVAL_SECONDS,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.min_interval = min_interval
+        self._subscribers: dict[str, set[asyncio.Queue[str]]] = {}
+        self._loaders: dict[str, Loader] = {}
+        self._pending: dict[str, asyncio.Task] = {}
+        self._last_push: dict[str, float] = {}
+        self._last_payload: dict[str, str] = {}
+        self.notifications = 0
+        self.pushes = 0
+
+    @asynccontextmanager
+    async def subscribe(self, key: str, loader: Loader):
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(key, set()).add(queue)
+        self._loaders[key] = loader
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(key, set())
+            subscribers.discard(queue)
+            if not subscribers:
+                self._forget(key)
+
+    def _forget(self, key: str):
+        self._subscribers.pop(key, None)
+        self._loaders.pop(key, None)
+        self._last_push.pop(key, None)
+        self._last_payload.pop(key, None)
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            pending.cancel()
+
+    def _on_notify(self, connection, pid, channel, payload: str):
+        self.notifications += 1
+        if payload in self._subscribers:
+            self._schedule(payload)
+
+    def _schedule(self, key: str):
+        if key not in self._pending:
+            self._pending[key] = asyncio.create_task(self._push(key))
+
+    async def _push(self, key: str):
+        delay = self._last_push.get(key, 0) + self.min_interval - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # Changes committed from here on schedule another push.
+        self._pending.pop(key, None)
+        loader = self._loaders.get(key)
+        if loader is None:
+            return
+        self._last_push[key] = time.monotonic()
+        try:
+            payload = await loader(key)
+        except Exception as e:
+            print(f"Error loading live results for {key}: {e}")
+            return
+        if payload == self._last_payload.get(key):
+            return
+        self._last_payload[key] = payload
+        self.pushes += 1
+        for queue in self._subscribers.get(key, ()):
+            offer(queue, payload)
+
+    async def listen(self):
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(self.channel, self._on_notify)
+                # Whatever was committed while no connection was listening has
+                # been missed; refresh every stream once.
+                for key in list(self._subscribers):
+                    self._schedule(key)
+                await closed.wait()
+                print("Live results listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Live results listener failed, reconnecting: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(1)
+
+    def stats(self):
+        return {
+            "keys": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "pending": len(self._pending),
+            "notifications": self.notifications,
+            "pushes": self.pushes,
+        }
+
+
+def offer(queue: asyncio.Queue[str], payload: str):
+    # A subscriber that has not sent the previous payload yet only needs the
+    # newest one.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(payload)
+
+
+# NOTIFY is not replicated, so this always listens on the primary.
+live_results = LiveResultsHub(
+    make_url(f"{DB_STRING}")
+    .set(drivername="postgresql")
+    .render_as_string(hide_password=False)
+)
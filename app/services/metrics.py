@@ -0,0 +1,188 @@
+from app.db.database import get_pool_status
+from app.utils.request_metrics import RequestMetrics, current_request_metrics
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...]):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        # labels -> (per-bucket counts, sum, count)
+        self._series: dict[tuple[tuple[str, str], ...], list] = {}
+
+    def observe(self, labels: dict[str, str], value: float):
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for key, (bucket_counts, total, count) in self._series.items():
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                labels = format_labels(key + (("le", format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = format_labels(key + (("le", "+Inf"),))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{format_labels(key)} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._series: dict[tuple[tuple[str, str], ...], int] = {}
+
+    def inc(self, labels: dict[str, str]):
+        key = tuple(sorted(labels.items()))
+        self._series[key] = self._series.get(key, 0) + 1
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+        for key, value in self._series.items():
+            lines.append(f"{self.name}{format_labels(key)} {value}")
+        return lines
+
+
+def format_value(value: float):
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def format_labels(labels: tuple[tuple[str, str], ...]):
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class RequestMetricsRegistry:
+    def __init__(self):
+        self.requests = Counter("http_requests_total", "Requests handled.")
+        self.duration = Histogram(
+            "http_request_duration_seconds",
+            "Wall time spent handling a request.",
+            LATENCY_BUCKETS,
+        )
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds",
+            "Time spent executing SQL statements per request.",
+            LATENCY_BUCKETS,
+        )
+        self.statements = Histogram(
+            "http_request_db_statements",
+            "SQL statements executed per request.",
+            STATEMENT_BUCKETS,
+        )
+        self.pool_wait = Histogram(
+            "http_request_db_pool_wait_seconds",
+            "Time spent waiting for a pooled database connection per request.",
+            LATENCY_BUCKETS,
+        )
+
+    def observe(self, method: str, route: str, status: int, metrics: RequestMetrics):
+        labels = {"method": method, "route": route}
+        self.requests.inc({**labels, "status": str(status)})
+        self.duration.observe(labels, metrics.elapsed())
+        self.db_duration.observe(labels, metrics.db_time)
+        self.statements.observe(labels, metrics.statements)
+        self.pool_wait.observe(labels, metrics.pool_wait)
+
+    def render(self):
+        lines = []
+        for metric in (
+            self.requests,
+            self.duration,
+            self.db_duration,
+            self.statements,
+            self.pool_wait,
+        ):
+            lines += metric.render()
+        pool = get_pool_status()
+        for name, key, description in (
+            ("db_pool_size", "pool_size", "Connections kept in the pool."),
+            ("db_pool_checked_out", "checked_out", "Connections in use."),
+            ("db_pool_idle", "idle", "Idle connections in the pool."),
+            ("db_pool_overflow", "overflow", "Connections opened beyond the pool."),
+        ):
+            lines += [
+                f"# HELP {name} {description}",
+                f"# TYPE {name} gauge",
+                f"{name} {pool[key]}",
+            ]
+        wait = pool["wait"]
+        lines += [
+            "# HELP db_pool_checkout_timeouts_total Pool checkouts that timed out.",
+            "# TYPE db_pool_checkout_timeouts_total counter",
+            f"db_pool_checkout_timeouts_total {wait['timeouts']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+request_metrics_registry = RequestMetricsRegistry()
+
+
+def server_timing(metrics: RequestMetrics):
+    return (
+        f"app;dur={metrics.elapsed() * 1000:.1f}, "
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.statements} queries", '
+        f"pool;dur={metrics.pool_wait * 1000:.1f}"
+    )
+
+
+class RequestMetricsMiddleware:
+    """Times every HTTP request and reports it through Server-Timing and the
+    metrics registry, labelled by route template rather than raw path."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics(scope)
+        token = current_request_metrics.set(metrics)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(metrics).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request_metrics.reset(token)
+            # The router stores the matched route in the scope it was given.
+            route = scope.get("route")
+            request_metrics_registry.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                metrics,
+            )
@@ -0,0 +1,125 @@
+from http.cookies import SimpleCookie
+
+from fastapi import HTTPException
+
+from app.auth.auth_service import get_current_user
+from app.db.database import async_session_maker
+from app.env import PROFILE_INTERVAL_SECONDS, PROFILING_ENABLED
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # optional dependency
+    Profiler = None
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_FORMATS = {
+    "html": "text/html; charset=utf-8",
+    "speedscope": "application/json",
+}
+
+
+def get_header(scope, name: bytes):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def is_admin_request(scope):
+    cookie = SimpleCookie(get_header(scope, b"cookie") or "")
+    if "session" not in cookie:
+        return False
+    session = cookie["session"].value
+    async with async_session_maker() as db_session:
+        try:
+            user = await get_current_user(db_session=db_session, session=session)
+        except HTTPException:
+            return False
+    return user.account_type == "admin"
+
+
+async def send_body(send, status: int, content_type: str, body: bytes, headers=()):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", content_type.encode()),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class ProfilingMiddleware:
+    """Profiles a single request when an admin sends `X-Profile: html` or
+    `X-Profile: speedscope`, and returns the profile instead of the response.
+
+    The header is ignored for everyone else, so they pay nothing for it.
+    Streaming responses (live results, exports) may never end, so they are
+    sent as they are, unprofiled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        profile_format = (
+            get_header(scope, PROFILE_HEADER) if scope["type"] == "http" else None
+        )
+        if (
+            not PROFILING_ENABLED
+            or profile_format not in PROFILE_FORMATS
+            or not await is_admin_request(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+        if Profiler is None:
+            await send_body(
+                send,
+                501,
+                "text/plain",
+                b"Profiling requires the pyinstrument package",
+            )
+            return
+
+        status = 500
+        start = None
+        streaming = False
+        profiler = Profiler(interval=PROFILE_INTERVAL_SECONDS, async_mode="enabled")
+
+        async def discard(message):
+            nonlocal status, start, streaming
+            if streaming:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                status = message["status"]
+                start = message
+            elif message.get("more_body", False):
+                streaming = True
+                profiler.stop()
+                await send(start)
+                await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            if profiler.is_running:
+                profiler.stop()
+        if streaming:
+            return
+        if profile_format == "speedscope":
+            body = profiler.output(renderer=SpeedscopeRenderer())
+        else:
+            body = profiler.output_html()
+        await send_body(
+            send,
+            200,
+            PROFILE_FORMATS[profile_format],
+            body.encode(),
+            headers=[(b"x-profiled-status", str(status).encode())],
+        )
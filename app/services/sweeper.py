@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime
+
+from sqlmodel import col, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.models import AuthSession, LoginSession, RevokedSession
+from app.env import SWEEP_BATCH_SIZE, SWEEP_INTERVAL_SECONDS
+
+SWEPT_MODELS = (AuthSession, LoginSession, RevokedSession)
+
+
+def sweep_batch_stmt(
+    model: type[AuthSession] | type[LoginSession] | type[RevokedSession],
+    batch_size: int,
+):
+    expired = (
+        select(model.id)
+        .where(col(model.expires_at) < datetime.now())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return delete(model).where(col(model.id).in_(expired))
+
+
+async def sweep_expired_rows(
+    model: type[AuthSession] | type[LoginSession] | type[RevokedSession],
+    batch_size: int,
+    db_session: AsyncSession,
+) -> int:
+    # Each batch is its own short transaction, and rows locked by a
+    # concurrent request are skipped rather than waited on.
+    reclaimed = 0
+    while True:
+        result = await db_session.exec(sweep_batch_stmt(model, batch_size))
+        await db_session.commit()
+        reclaimed += result.rowcount
+        if result.rowcount < batch_size:
+            return reclaimed
+
+
+async def sweep_expired_sessions(
+    session_maker, batch_size: int = SWEEP_BATCH_SIZE
+) -> dict[str, int]:
+    reclaimed = {}
+    async with session_maker() as db_session:
+        for model in SWEPT_MODELS:
+            reclaimed[model.__tablename__] = await sweep_expired_rows(
+                model, batch_size, db_session
+            )
+    return reclaimed
+
+
+async def sweep_expired_sessions_periodically(session_maker):
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+        try:
+            reclaimed = await sweep_expired_sessions(session_maker)
+            print(f"Swept expired sessions: {reclaimed}")
+        except Exception as e:
+            print(f"Error sweeping expired sessions: {e}")
@@ -0,0 +1,34 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Sequence, TypeVar
+
+from fastapi import HTTPException
+
+T = TypeVar("T")
+
+
+def encode_cursor(value: Any) -> str:
+    payload = json.dumps(value, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, parse: Callable[[Any], T] = lambda value: value) -> T:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return parse(json.loads(payload))
+    # Anything but the expected payload fails in `parse` one way or another,
+    # e.g. UUID(5) raises AttributeError.
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def split_page(
+    rows: Sequence[T], limit: int, cursor_key: Callable[[T], Any]
+) -> tuple[list[T], str | None]:
+    """Split the `limit + 1` rows of a keyset query into the page and the
+    cursor of the following page, if there is one."""
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(cursor_key(page[-1]))
@@ -0,0 +1,35 @@
+import time
+from contextvars import ContextVar
+
+
+class RequestMetrics:
+    """Timings collected while a single request is being handled."""
+
+    def __init__(self, scope: dict | None = None):
+        self.scope = scope or {}
+        self.started = time.perf_counter()
+        self.db_time = 0.0
+        self.statements = 0
+        self.pool_wait = 0.0
+
+    def record_statement(self, duration: float):
+        self.statements += 1
+        self.db_time += duration
+
+    def record_pool_wait(self, duration: float):
+        self.pool_wait += duration
+
+    def route(self):
+        # Set by the router once the request has been matched.
+        route = self.scope.get("route")
+        if route is None:
+            return None
+        return f"{self.scope['method']} {route.path}"
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+current_request_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_request_metrics", default=None
+)
@@ -0,0 +1,16 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by pydantic-core.
+
+    Models, UUIDs and datetimes are serialized natively in one pass, so
+    services can return models wrapped in this response and skip FastAPI's
+    `jsonable_encoder` round trip through plain Python objects.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
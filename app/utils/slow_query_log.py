@@ -0,0 +1,53 @@
+from collections import deque
+from datetime import datetime
+
+MAX_STATEMENT_LENGTH = 2000
+MAX_LISTED_PARAMETERS = 10
+
+
+def parameter_shape(parameters):
+    """Describe bound parameters by type only, so values never reach the log."""
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if len(parameters) > MAX_LISTED_PARAMETERS:
+            types = sorted({type(value).__name__ for value in parameters})
+            return f"{len(parameters)} values of {', '.join(types)}"
+        return [parameter_shape(value) for value in parameters]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """Keeps the most recent statements that ran over the threshold."""
+
+    def __init__(self, threshold_ms: float, size: int):
+        self.threshold_ms = threshold_ms
+        self.entries: deque[dict] = deque(maxlen=size)
+
+    def record(
+        self,
+        statement: str,
+        parameters,
+        executemany: bool,
+        duration: float,
+        route: str | None,
+    ):
+        duration_ms = duration * 1000
+        if self.threshold_ms <= 0 or duration_ms < self.threshold_ms:
+            return
+        entry = {
+            "at": datetime.now().isoformat(),
+            "duration_ms": round(duration_ms, 2),
+            "route": route,
+            "statement": statement[:MAX_STATEMENT_LENGTH],
+            "parameters": (
+                f"{len(parameters)} rows of {parameter_shape(parameters[0])}"
+                if executemany and parameters
+                else parameter_shape(parameters)
+            ),
+        }
+        self.entries.append(entry)
+        print(
+            f"Slow query ({entry['duration_ms']}ms, route {route}): "
+            f"{' '.join(statement.split())[:200]} params {entry['parameters']}"
+        )
@@ -0,0 +1,220 @@
+"""Concurrent-request throughput of the sync and the async database paths.
+
+Serves the same survey read two ways and drives both with the same pool of
+concurrent clients:
+
+- "sync" is how every route worked before the move to AsyncSession: an
+  `async def` handler calling a synchronous `Session` on psycopg2, which
+  blocks the event loop for every round trip.
+- "async" awaits an `AsyncSession` on asyncpg, as the routes do now.
+
+A share of the requests (--slow-every) runs a query that takes --slow-ms
+instead, to show what one slow query does to every other request:
+
+    BENCHMARK_DB_STRING=postgresql://... python -m benchmarks.async_driver
+
+The database named by BENCHMARK_DB_STRING is wiped before every run. Results
+are written to benchmarks/async_driver.json.
+
+Keep --concurrency below the pool size plus overflow (15 by default): past
+that the sync path stalls for the whole pool timeout, since a handler waiting
+for a connection blocks the loop that would release the others.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Annotated
+from uuid import UUID, uuid4
+
+if not os.getenv("BENCHMARK_DB_STRING"):
+    sys.exit("Set BENCHMARK_DB_STRING to a scratch database; it will be wiped.")
+os.environ["DB_STRING"] = os.environ["BENCHMARK_DB_STRING"]
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import insert, text
+from sqlalchemy.orm import joinedload
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.database import (
+    async_engine,
+    engine,
+    generate_database_session,
+    setup_db,
+)
+from app.db.models import Survey, User
+from app.routes.schemas.survey_schemas import SurveySchema
+
+RESULTS_PATH = Path(__file__).with_name("async_driver.json")
+AUTHOR = "driver@bench.loslc.io"
+
+bench_app = FastAPI()
+
+
+def generate_sync_session():
+    # The dependency every route used before AsyncSession.
+    with Session(engine) as session:
+        yield session
+
+
+@bench_app.get("/sync/surveys/{survey_id}")
+async def gt_sync_survey(
+    survey_id: UUID, db_session: Annotated[Session, Depends(generate_sync_session)]
+):
+    survey = db_session.get(Survey, survey_id, options=[joinedload(Survey.author)])
+    return SurveySchema.from_model(survey)
+
+
+@bench_app.get("/sync/slow")
+async def gt_sync_slow(
+    seconds: float, db_session: Annotated[Session, Depends(generate_sync_session)]
+):
+    db_session.exec(text("SELECT pg_sleep(:seconds)"), params={"seconds": seconds})
+
+
+@bench_app.get("/async/surveys/{survey_id}")
+async def gt_async_survey(
+    survey_id: UUID,
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    survey = await db_session.get(
+        Survey, survey_id, options=[joinedload(Survey.author)]
+    )
+    return SurveySchema.from_model(survey)
+
+
+@bench_app.get("/async/slow")
+async def gt_async_slow(
+    seconds: float,
+    db_session: Annotated[AsyncSession, Depends(generate_database_session)],
+):
+    await db_session.exec(
+        text("SELECT pg_sleep(:seconds)"), params={"seconds": seconds}
+    )
+
+
+def seed(surveys: int):
+    survey_ids = [uuid4() for _ in range(surveys)]
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+    setup_db()
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            {"email": AUTHOR, "id": uuid4(), "username": "driver"},
+        )
+        connection.execute(
+            insert(Survey),
+            [
+                {
+                    "id": survey_id,
+                    "author_email": AUTHOR,
+                    "title": f"Survey {i}",
+                    "description": "",
+                    "active": True,
+                }
+                for i, survey_id in enumerate(survey_ids)
+            ],
+        )
+    return survey_ids
+
+
+async def drive(
+    path: str,
+    survey_ids: list[UUID],
+    requests: int,
+    concurrency: int,
+    slow_every: int,
+    slow_ms: float,
+):
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+    latencies: list[float] = []
+    errors = 0
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal errors
+        while not queue.empty():
+            i = queue.get_nowait()
+            if slow_every and i % slow_every == 0:
+                await client.get(f"/{path}/slow", params={"seconds": slow_ms / 1000})
+                continue
+            started = time.perf_counter()
+            response = await client.get(
+                f"/{path}/surveys/{survey_ids[i % len(survey_ids)]}"
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=bench_app), base_url="http://bench"
+    ) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentiles[49], 2),
+        "p95_ms": round(percentiles[94], 2),
+        "p99_ms": round(percentiles[98], 2),
+    }
+
+
+async def run(args, survey_ids: list[UUID]):
+    report = {}
+    for slow_every in (0, args.slow_every):
+        label = f"slow 1/{slow_every}" if slow_every else "reads only"
+        for path in ("sync", "async"):
+            # One warm-up pass so both pools start full.
+            await drive(
+                path, survey_ids, args.concurrency, args.concurrency, 0, args.slow_ms
+            )
+            result = await drive(
+                path,
+                survey_ids,
+                args.requests,
+                args.concurrency,
+                slow_every,
+                args.slow_ms,
+            )
+            report[f"{label}.{path}"] = result
+            print(
+                f"{label:<12}{path:<7}{result['throughput_rps']:>10}"
+                f"{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}"
+            )
+    await async_engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--surveys", type=int, default=200)
+    parser.add_argument("--slow-every", type=int, default=20)
+    parser.add_argument("--slow-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    survey_ids = seed(args.surveys)
+    print(f"{'':<12}{'path':<7}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    report = asyncio.run(run(args, survey_ids))
+    engine.dispose()
+    RESULTS_PATH.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Wrote {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
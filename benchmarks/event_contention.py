@@ -0,0 +1,204 @@
+"""Seat allocation under contention for a capacity-limited event.
+
+Seeds one event and a crowd of users, then has several worker processes, each
+with its own engine and a pool of concurrent clients, hammer the join and
+leave endpoints of that event at the same time:
+
+    BENCHMARK_DB_STRING=postgresql://... python -m benchmarks.event_contention
+
+The database named by BENCHMARK_DB_STRING is wiped before every run. After
+each phase the participant counter is checked against the capacity, the
+EventUserLink rows and the waitlist; the run fails on any mismatch.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+if not os.getenv("BENCHMARK_DB_STRING"):
+    sys.exit("Set BENCHMARK_DB_STRING to a scratch database; it will be wiped.")
+os.environ["DB_STRING"] = os.environ["BENCHMARK_DB_STRING"]
+os.environ.setdefault("SWEEP_INTERVAL_SECONDS", "0")
+
+import httpx
+from sqlalchemy import insert, text
+
+from app.app import app
+from app.db.database import async_engine, engine, setup_db
+from app.db.models import AuthSession, Event, User
+
+
+def seed(users: int, capacity: int):
+    event_id = uuid4()
+    expires_at = datetime.now() + timedelta(days=1)
+    rows = [
+        {
+            "email": f"rsvp{i}@bench.loslc.io",
+            "username": f"rsvp{i}",
+            "account_type": "user",
+        }
+        for i in range(users)
+    ]
+    sessions = [
+        {"id": uuid4().hex, "user_email": row["email"], "expires_at": expires_at}
+        for row in rows
+    ]
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+    setup_db()
+    with engine.begin() as connection:
+        connection.execute(insert(User), rows)
+        connection.execute(insert(AuthSession), sessions)
+        connection.execute(
+            insert(Event),
+            {
+                "id": event_id,
+                "title": "Launch meetup",
+                "description": "",
+                "date": datetime.now() + timedelta(days=7),
+                "location": "",
+                "cover_image_url": "",
+                "capacity": capacity,
+                "participant_count": 0,
+                "author_email": rows[0]["email"],
+            },
+        )
+    # Worker processes open their own connections.
+    engine.dispose()
+    return event_id, [session["id"] for session in sessions]
+
+
+async def hammer(event_id, action: str, sessions: list[str], concurrency: int):
+    statuses: dict[int, int] = {}
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for session in sessions:
+        queue.put_nowait(session)
+
+    async def client_loop(client: httpx.AsyncClient):
+        while not queue.empty():
+            session = queue.get_nowait()
+            response = await client.post(
+                f"/v1/events/{event_id}/{action}",
+                headers={"Cookie": f"session={session}"},
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    # Pooled connections belong to this event loop; the next phase runs in
+    # a new one.
+    await async_engine.dispose()
+    return statuses
+
+
+def worker(event_id, action: str, sessions: list[str], concurrency: int):
+    return asyncio.run(hammer(event_id, action, sessions, concurrency))
+
+
+def run_phase(pool, event_id, action: str, sessions: list[str], args):
+    chunks = [sessions[i :: args.processes] for i in range(args.processes)]
+    started = time.perf_counter()
+    results = pool.starmap(
+        worker, [(event_id, action, chunk, args.concurrency) for chunk in chunks]
+    )
+    elapsed = time.perf_counter() - started
+    statuses: dict[int, int] = {}
+    for result in results:
+        for status, count in result.items():
+            statuses[status] = statuses.get(status, 0) + count
+    print(
+        f"{action:<6}{len(sessions):>7} requests{elapsed:>8.2f}s"
+        f"{len(sessions) / elapsed:>9.0f} req/s  statuses {sorted(statuses.items())}"
+    )
+    return statuses
+
+
+def check(event_id, capacity: int, remaining: int):
+    with engine.connect() as connection:
+        count = connection.execute(
+            text("SELECT participant_count FROM event WHERE id = :id"),
+            {"id": event_id},
+        ).scalar_one()
+        links = connection.execute(
+            text("SELECT count(*) FROM eventuserlink WHERE event_id = :id"),
+            {"id": event_id},
+        ).scalar_one()
+        waitlisted = connection.execute(
+            text("SELECT count(*) FROM eventwaitlist WHERE event_id = :id"),
+            {"id": event_id},
+        ).scalar_one()
+        both = connection.execute(
+            text(
+                "SELECT count(*) FROM eventwaitlist JOIN eventuserlink"
+                " USING (event_id, user_email) WHERE event_id = :id"
+            ),
+            {"id": event_id},
+        ).scalar_one()
+    engine.dispose()
+    print(
+        f"      participant_count={count} links={links} waitlisted={waitlisted}"
+        f" capacity={capacity}"
+    )
+    failures = []
+    if count > capacity:
+        failures.append(f"participant_count {count} exceeds capacity {capacity}")
+    if count != links:
+        failures.append(f"participant_count {count} != {links} EventUserLink rows")
+    # Freed seats go to the waitlist, and nobody who left is still listed.
+    if count != min(remaining, capacity):
+        failures.append(
+            f"expected {min(remaining, capacity)} participants, got {count}"
+        )
+    if links + waitlisted != remaining:
+        failures.append(f"{links + waitlisted} users listed, {remaining} remain")
+    if both:
+        failures.append(f"{both} users are both participants and waitlisted")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--capacity", type=int, default=500)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    event_id, sessions = seed(args.users, args.capacity)
+    shuffled = random.Random(args.seed)
+    failures = []
+    with multiprocessing.get_context("fork").Pool(args.processes) as pool:
+        # Everyone at once, some of them twice: duplicates must be no-ops.
+        joins = sessions + shuffled.sample(sessions, len(sessions) // 10)
+        shuffled.shuffle(joins)
+        statuses = run_phase(pool, event_id, "join", joins, args)
+        if set(statuses) - {200, 202}:
+            failures.append(f"unexpected join statuses {statuses}")
+        failures += check(event_id, args.capacity, args.users)
+
+        # Half of the crowd leaves, participants and waitlisted alike, while
+        # the seats they free are handed to the waitlist.
+        leaving = shuffled.sample(sessions, len(sessions) // 2)
+        statuses = run_phase(pool, event_id, "leave", leaving, args)
+        if set(statuses) - {200}:
+            failures.append(f"unexpected leave statuses {statuses}")
+        failures += check(event_id, args.capacity, args.users - len(leaving))
+
+    for failure in failures:
+        print(f"FAILED {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+"""Load test for the main user flows.
+
+Runs the app in-process against a scratch Postgres database and a local SMTP
+sink, drives each scenario with a pool of concurrent virtual users and reports
+throughput, p50/p95/p99 latency and SQL statements per request:
+
+    BENCHMARK_DB_STRING=postgresql://... python -m benchmarks.load_test
+
+The database named by BENCHMARK_DB_STRING is wiped before every run. Results
+are compared with benchmarks/baseline.json and the run fails when a step
+regresses by more than --threshold; --update-baseline rewrites the file.
+Latencies depend on the machine, so refresh the baseline on the machine the
+comparison runs on.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+# Set before anything imports app.env. main() refuses to run without a
+# database, but importing this module must not exit.
+os.environ["DB_STRING"] = os.getenv("BENCHMARK_DB_STRING") or "postgresql://unused"
+os.environ["SMTP_HOST"] = "127.0.0.1"
+os.environ["SMTP_PORT"] = os.getenv("BENCHMARK_SMTP_PORT", "8025")
+os.environ["SMTP_USE_SSL"] = "false"
+os.environ["SMTP_USERNAME"] = ""
+os.environ.setdefault("EMAIL_ADDRESS", "benchmark@loslc.io")
+os.environ.setdefault("SWEEP_INTERVAL_SECONDS", "0")
+
+import httpx
+from aiosmtpd.controller import Controller
+from sqlalchemy import event, insert, text
+
+from app.app import app
+from app.db.database import async_engine, engine, setup_db
+from app.db.models import (
+    AuthSession,
+    Survey,
+    SurveyQuestion,
+    SurveyResponse,
+    User,
+)
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+PAGE_SIZE = 50
+
+statement_counter: ContextVar[list[int] | None] = ContextVar(
+    "statement_counter", default=None
+)
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    # The ASGI transport runs the app in the client's task, so the counter set
+    # around a request only sees that request's statements.
+    counter = statement_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class MailSink:
+    """aiosmtpd handler; it runs on the controller's own thread and loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.messages: dict[str, asyncio.Queue[str]] = {}
+
+    def inbox(self, address: str):
+        return self.messages.setdefault(address.lower(), asyncio.Queue())
+
+    def deliver(self, address: str, content: str):
+        self.inbox(address).put_nowait(content)
+
+    async def handle_DATA(self, server, session, envelope):
+        for address in envelope.rcpt_tos:
+            self.loop.call_soon_threadsafe(
+                self.deliver, address, envelope.content.decode()
+            )
+        return "250 OK"
+
+
+class Samples:
+    def __init__(self):
+        self.steps: dict[str, list[tuple[float, int]]] = {}
+        self.errors: dict[str, int] = {}
+        self.elapsed: dict[str, float] = {}
+
+    async def request(self, step: str, request, expected: int = 200):
+        counter = [0]
+        token = statement_counter.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await request
+        finally:
+            statement_counter.reset(token)
+        latency = time.perf_counter() - started
+        self.steps.setdefault(step, []).append((latency, counter[0]))
+        if response.status_code != expected:
+            self.errors[step] = self.errors.get(step, 0) + 1
+        return response
+
+    def report(self):
+        report = {}
+        for step, samples in self.steps.items():
+            latencies = sorted(latency * 1000 for latency, _ in samples)
+            percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+            report[step] = {
+                "requests": len(samples),
+                "errors": self.errors.get(step, 0),
+                "throughput_rps": round(len(samples) / self.elapsed[step], 1),
+                "p50_ms": round(percentiles[49], 2),
+                "p95_ms": round(percentiles[94], 2),
+                "p99_ms": round(percentiles[98], 2),
+                "statements_per_request": round(
+                    sum(statements for _, statements in samples) / len(samples), 2
+                ),
+            }
+        return report
+
+
+class Fixtures:
+    """Rows seeded straight into the database before the scenarios run."""
+
+    def __init__(self, users: int, responders: int):
+        self.admin_session = ""
+        self.user_sessions: list[str] = []
+        self.questions_survey_id = uuid4()
+        self.paging_survey_id = uuid4()
+        self.submit_survey_id = uuid4()
+        self.submit_question_ids = [uuid4() for _ in range(3)]
+        self.users = users
+        # A user answers a survey only once, so every submission comes from
+        # a different one.
+        self.responders = responders
+
+    def seed(self, filler_surveys: int, paging_responses: int):
+        expires_at = datetime.now() + timedelta(days=1)
+        admin_email = "admin@bench.loslc.io"
+        users = [{"email": admin_email, "username": "admin", "account_type": "admin"}]
+        users += [
+            {
+                "email": f"user{i}@bench.loslc.io",
+                "username": f"user{i}",
+                "account_type": "user",
+            }
+            for i in range(max(self.users, self.responders))
+        ]
+        sessions = [
+            {"id": uuid4().hex, "user_email": user["email"], "expires_at": expires_at}
+            for user in users
+        ]
+        self.admin_session = sessions[0]["id"]
+        self.user_sessions = [session["id"] for session in sessions[1:]]
+
+        surveys = [
+            {
+                "id": self.submit_survey_id,
+                "title": "Submit",
+                "description": "",
+                "active": True,
+            }
+        ]
+        surveys += [
+            {"id": uuid4(), "title": f"Filler {i}", "description": "", "active": True}
+            for i in range(filler_surveys)
+        ]
+        surveys += [
+            {
+                "id": self.questions_survey_id,
+                "title": "Questions",
+                "description": "",
+                "active": True,
+            },
+            {
+                "id": self.paging_survey_id,
+                "title": "Paging",
+                "description": "",
+                "active": True,
+            },
+        ]
+        question_types = ["select", "multiselect", "text"]
+        questions = [
+            {
+                "id": question_id,
+                "survey_id": self.submit_survey_id,
+                "question_type": question_type,
+            }
+            for question_id, question_type in zip(
+                self.submit_question_ids, question_types
+            )
+        ]
+        questions += [
+            {
+                "id": uuid4(),
+                "survey_id": self.questions_survey_id,
+                "question_type": question_types[i % 3],
+            }
+            for i in range(10)
+        ]
+        paging_questions = [
+            {"id": uuid4(), "survey_id": self.paging_survey_id, "question_type": "text"}
+            for _ in range(paging_responses)
+        ]
+        responses = [
+            {
+                "id": uuid4(),
+                "survey_id": self.paging_survey_id,
+                "question_id": question["id"],
+                "responder_email": users[1 + i % self.users]["email"],
+                "values": ["answer"],
+            }
+            for i, question in enumerate(paging_questions)
+        ]
+        for survey in surveys:
+            survey["author_email"] = admin_email
+        for i, question in enumerate(questions + paging_questions):
+            question["author_email"] = admin_email
+            question["title"] = f"Question {i}"
+
+        with engine.begin() as connection:
+            connection.execute(text("DROP SCHEMA public CASCADE"))
+            connection.execute(text("CREATE SCHEMA public"))
+        setup_db()
+        with engine.begin() as connection:
+            connection.execute(insert(User), users)
+            connection.execute(insert(AuthSession), sessions)
+            connection.execute(insert(Survey), surveys)
+            connection.execute(insert(SurveyQuestion), questions + paging_questions)
+            connection.execute(insert(SurveyResponse), responses)
+        engine.dispose()
+
+
+def session_cookie(session_id: str):
+    return {"Cookie": f"session={session_id}"}
+
+
+async def auth_flow(client: httpx.AsyncClient, samples: Samples, sink: MailSink, i):
+    email = f"new{i}-{uuid4().hex[:8]}@bench.loslc.io"
+    await samples.request(
+        "auth.register",
+        client.post("/v1/auth/register", data={"username": email, "email": email}),
+        expected=201,
+    )
+    await samples.request(
+        "auth.login", client.post("/v1/auth/login", data={"email": email})
+    )
+    # Delivery through the outbox is asynchronous and not part of any request.
+    message = await asyncio.wait_for(sink.inbox(email).get(), timeout=30)
+    token = message.split("token=")[1].split()[0]
+    await samples.request(
+        "auth.verify",
+        client.get("/v1/auth/token", params={"token": token}),
+    )
+
+
+async def list_surveys(client, samples: Samples, fixtures: Fixtures, i):
+    # Listing is restricted to admins.
+    await samples.request(
+        "surveys.list",
+        client.get(
+            "/v1/surveys",
+            params={"limit": 20},
+            headers=session_cookie(fixtures.admin_session),
+        ),
+    )
+
+
+async def get_questions(client, samples: Samples, fixtures: Fixtures, i):
+    await samples.request(
+        "surveys.questions",
+        client.get(
+            f"/v1/surveys/{fixtures.questions_survey_id}/questions",
+            headers=session_cookie(fixtures.user_sessions[i % fixtures.users]),
+        ),
+    )
+
+
+async def submit_responses(client, samples: Samples, fixtures: Fixtures, i):
+    answers = [["a"], ["x", "y"], ["free text"]]
+    await samples.request(
+        "responses.submit",
+        client.post(
+            f"/v1/surveys/{fixtures.submit_survey_id}/responses",
+            json={
+                "answers": [
+                    {"question_id": str(question_id), "answers": answer}
+                    for question_id, answer in zip(
+                        fixtures.submit_question_ids, answers
+                    )
+                ]
+            },
+            headers=session_cookie(fixtures.user_sessions[i]),
+        ),
+        expected=201,
+    )
+
+
+async def page_responses(client, samples: Samples, fixtures: Fixtures, i):
+    cursor = None
+    while True:
+        params = {"limit": PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        response = await samples.request(
+            "responses.admin_page",
+            client.get(
+                f"/v1/surveys/{fixtures.paging_survey_id}/responses",
+                params=params,
+                headers=session_cookie(fixtures.admin_session),
+            ),
+        )
+        cursor = response.json().get("next_cursor")
+        if not cursor:
+            return
+
+
+async def run_scenario(step, iterations: int, concurrency: int):
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(iterations):
+        queue.put_nowait(i)
+
+    async def virtual_user():
+        while not queue.empty():
+            await step(queue.get_nowait())
+
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+
+
+async def run(args):
+    fixtures = Fixtures(users=args.concurrency * 4, responders=args.iterations)
+    fixtures.seed(filler_surveys=200, paging_responses=args.paging_responses)
+    sink = MailSink(asyncio.get_running_loop())
+    controller = Controller(
+        sink, hostname="127.0.0.1", port=int(os.environ["SMTP_PORT"])
+    )
+    controller.start()
+    samples = Samples()
+    scenarios = {
+        "auth": lambda client, i: auth_flow(client, samples, sink, i),
+        "surveys.list": lambda client, i: list_surveys(client, samples, fixtures, i),
+        "surveys.questions": lambda client, i: get_questions(
+            client, samples, fixtures, i
+        ),
+        "responses.submit": lambda client, i: submit_responses(
+            client, samples, fixtures, i
+        ),
+        "responses.admin_page": lambda client, i: page_responses(
+            client, samples, fixtures, i
+        ),
+    }
+    iterations = {"responses.admin_page": max(args.iterations // 20, 1)}
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                for name, scenario in scenarios.items():
+                    started = time.perf_counter()
+                    await run_scenario(
+                        lambda i, scenario=scenario: scenario(client, i),
+                        iterations.get(name, args.iterations),
+                        args.concurrency,
+                    )
+                    elapsed = time.perf_counter() - started
+                    for step in samples.steps:
+                        samples.elapsed.setdefault(step, elapsed)
+    finally:
+        controller.stop()
+    return samples.report()
+
+
+def compare(report: dict, baseline: dict, threshold: float, min_delta_ms: float):
+    regressions = []
+    for step, current in report.items():
+        previous = baseline.get(step)
+        if not previous:
+            continue
+        # Fast steps jitter by a few milliseconds, which is a large fraction of
+        # their latency; only a slowdown that is also large in absolute terms
+        # counts.
+        if current["p95_ms"] > max(
+            previous["p95_ms"] * (1 + threshold), previous["p95_ms"] + min_delta_ms
+        ):
+            regressions.append(
+                f"{step}: p95 {current['p95_ms']}ms > {previous['p95_ms']}ms"
+            )
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{step}: throughput {current['throughput_rps']}/s"
+                f" < {previous['throughput_rps']}/s"
+            )
+        # Statement counts are deterministic, so any increase is a regression.
+        if current["statements_per_request"] > previous["statements_per_request"]:
+            regressions.append(
+                f"{step}: {current['statements_per_request']} statements/request"
+                f" > {previous['statements_per_request']}"
+            )
+    return regressions
+
+
+def print_report(report: dict):
+    columns = [
+        "requests",
+        "errors",
+        "throughput_rps",
+        "p50_ms",
+        "p95_ms",
+        "p99_ms",
+        "statements_per_request",
+    ]
+    headers = ["requests", "errors", "req/s", "p50 ms", "p95 ms", "p99 ms", "stmts/req"]
+    print(f"{'step':<22}" + "".join(f"{header:>11}" for header in headers))
+    for step, result in report.items():
+        print(f"{step:<22}" + "".join(f"{result[column]:>11}" for column in columns))
+
+
+def main():
+    if not os.getenv("BENCHMARK_DB_STRING"):
+        sys.exit("Set BENCHMARK_DB_STRING to a scratch database; it will be wiped.")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--paging-responses", type=int, default=1000)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--min-delta-ms", type=float, default=10)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if any(result["errors"] for result in report.values()):
+        sys.exit("Some requests failed; see the errors column.")
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+    if not BASELINE_PATH.exists():
+        print("No baseline to compare with; run with --update-baseline.")
+        return
+    baseline = json.loads(BASELINE_PATH.read_text())
+    regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Full-text search latency as the survey and event tables grow.
+
+Grows both tables step by step to each of --sizes rows with generated text,
+then times the search service for a few kinds of query at every step:
+
+    BENCHMARK_DB_STRING=postgresql://... python -m benchmarks.search \\
+        [--sizes 10000,100000,1000000] [--repeat 20]
+
+The database named by BENCHMARK_DB_STRING is wiped before every run.
+
+The "needle" terms match the same handful of rows at every size, so the GIN
+lookup should keep their latency flat. Terms whose matches grow with the
+table must rank every match before the first page is known, so expect those
+to grow with the match count instead.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+if not os.getenv("BENCHMARK_DB_STRING"):
+    sys.exit("Set BENCHMARK_DB_STRING to a scratch database; it will be wiped.")
+os.environ["DB_STRING"] = os.environ["BENCHMARK_DB_STRING"]
+
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.db.database import (
+    async_engine,
+    async_session_maker,
+    engine,
+    setup_db,
+)
+from app.db.models import User
+from app.routes.services.search_service import search
+
+AUTHOR = "search@bench.loslc.io"
+NEEDLE_ROWS = 25
+WORDS = (
+    "linux kernel debian fedora arch ubuntu gentoo alpine nixos bsd shell bash "
+    "zsh vim emacs git patch commit merge branch rebase compiler gcc clang rust "
+    "python golang haskell ocaml erlang elixir java scala kotlin swift android "
+    "firmware driver module network router firewall proxy dns dhcp ssh tls "
+    "certificate container docker podman kubernetes cluster storage filesystem "
+    "btrfs zfs ext4 raid backup mirror package repository release version "
+    "license copyleft gnu freedom community meetup workshop hackathon conference "
+    "talk slides install party mentoring beginner advanced tutorial documentation "
+    "translation wiki forum mailing list chat matrix irc server desktop gnome kde "
+    "xfce wayland xorg terminal editor browser firefox thunderbird libreoffice "
+    "gimp inkscape blender audio video codec stream camera printer scanner laptop "
+    "raspberry arduino board sensor robot maker electronics soldering hardware"
+).split()
+QUERIES = {
+    "needle": "penguinarium",
+    "needle phrase": '"penguinarium workshop"',
+    "common word": "kernel",
+    "two words": "debian firewall",
+    "excluded": "docker -kubernetes",
+}
+
+GROW_SURVEYS = text(
+    """
+    INSERT INTO survey (id, author_email, title, description, active, version)
+    SELECT gen_random_uuid(), :author,
+        (SELECT string_agg(
+            (:words)[1 + floor(random() * cardinality(:words))::int], ' ')
+         FROM generate_series(1, 4) WHERE g > 0),
+        (SELECT string_agg(
+            (:words)[1 + floor(random() * cardinality(:words))::int], ' ')
+         FROM generate_series(1, 24) WHERE g > 0),
+        true, 1
+    FROM generate_series(1, :rows) AS g
+    """
+)
+GROW_EVENTS = text(
+    """
+    INSERT INTO event (id, author_email, title, description, date, location,
+        cover_image_url, participant_count)
+    SELECT gen_random_uuid(), :author,
+        (SELECT string_agg(
+            (:words)[1 + floor(random() * cardinality(:words))::int], ' ')
+         FROM generate_series(1, 4) WHERE g > 0),
+        (SELECT string_agg(
+            (:words)[1 + floor(random() * cardinality(:words))::int], ' ')
+         FROM generate_series(1, 24) WHERE g > 0),
+        now() + g * interval '1 minute',
+        (SELECT string_agg(
+            (:words)[1 + floor(random() * cardinality(:words))::int], ' ')
+         FROM generate_series(1, 2) WHERE g > 0),
+        '', 0
+    FROM generate_series(1, :rows) AS g
+    """
+)
+NEEDLES = (
+    text(
+        "UPDATE survey SET title = title || ' penguinarium workshop'"
+        " WHERE id IN (SELECT id FROM survey LIMIT :rows)"
+    ),
+    text(
+        "UPDATE event SET description = description || ' penguinarium workshop'"
+        " WHERE id IN (SELECT id FROM event LIMIT :rows)"
+    ),
+)
+
+
+def reset():
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+    setup_db()
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                'INSERT INTO "user" (email, id, username, account_type)'
+                " VALUES (:email, gen_random_uuid(), 'search', 'admin')"
+            ),
+            {"email": AUTHOR},
+        )
+
+
+def grow(current: int, size: int):
+    rows = size - current
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        for statement in (GROW_SURVEYS, GROW_EVENTS):
+            connection.execute(
+                statement, {"author": AUTHOR, "words": WORDS, "rows": rows}
+            )
+        if not current:
+            for statement in NEEDLES:
+                connection.execute(statement, {"rows": NEEDLE_ROWS})
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("VACUUM ANALYZE survey"))
+        connection.execute(text("VACUUM ANALYZE event"))
+    print(
+        f"grew to {size} surveys and {size} events"
+        f" in {time.perf_counter() - started:.1f}s"
+    )
+
+
+async def count_matches(q: str):
+    async with async_engine.connect() as connection:
+        return (
+            await connection.execute(
+                text(
+                    "SELECT (SELECT count(*) FROM survey"
+                    " WHERE search_vector @@ websearch_to_tsquery('english', :q))"
+                    " + (SELECT count(*) FROM event"
+                    " WHERE search_vector @@ websearch_to_tsquery('english', :q))"
+                ),
+                {"q": q},
+            )
+        ).scalar_one()
+
+
+async def measure(size: int, repeat: int, limit: int):
+    user = User(email=AUTHOR, username="search", account_type="admin")
+    results = {}
+    for name, q in QUERIES.items():
+        matches = await count_matches(q)
+        timings = []
+        async with async_session_maker() as db_session:
+            try:
+                # One warm-up run so the first sample does not pay for cold
+                # pages.
+                await search(q, None, limit, user, db_session)
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    await search(q, None, limit, user, db_session)
+                    timings.append((time.perf_counter() - started) * 1000)
+            except HTTPException as e:
+                # Rejected by SEARCH_STATEMENT_TIMEOUT_MS as too broad.
+                print(f"{size:>10}  {name:<16}{matches:>10}  {e.detail}")
+                results[name] = {"matches": matches, "rejected": True}
+                continue
+        timings.sort()
+        results[name] = {
+            "matches": matches,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 2),
+        }
+        print(
+            f"{size:>10}  {name:<16}{matches:>10}"
+            f"{results[name]['p50_ms']:>10}{results[name]['p95_ms']:>10}"
+        )
+    return results
+
+
+async def run(args):
+    print(f"{'rows':>10}  {'query':<16}{'matches':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    report = {}
+    current = 0
+    for size in args.sizes:
+        # Growing is synchronous; keep it out of the measured event loop work.
+        await asyncio.to_thread(grow, current, size)
+        current = size
+        report[size] = await measure(size, args.repeat, args.limit)
+    await async_engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: sorted(int(size) for size in value.split(",")),
+        default=[10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    reset()
+    report = asyncio.run(run(args))
+    smallest, largest = report[args.sizes[0]], report[args.sizes[-1]]
+    for name in ("needle", "needle phrase"):
+        growth = largest[name]["p50_ms"] / max(smallest[name]["p50_ms"], 0.01)
+        print(f"{name}: p50 x{growth:.1f} from {args.sizes[0]} to {args.sizes[-1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Per-row serialization cost of list payloads.
+
+Compares the generic pipeline (schemas built field by field with a separate
+nested UserSchema, then FastAPI's jsonable_encoder and the stdlib JSON
+encoder) with the one the services use (one from_attributes validation per
+row, encoded by pydantic-core):
+
+    python -m benchmarks.serialization [--rows 1000] [--repeat 20]
+
+No database is needed; rows are built in memory.
+"""
+
+import argparse
+import os
+import timeit
+import uuid
+
+os.environ.setdefault("DB_STRING", "postgresql://benchmark@localhost/benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.db.models import Survey, SurveyQuestion, SurveyResponse, User
+from app.routes.schemas.pagination_schemas import Page
+from app.routes.schemas.survey_schemas import (
+    SurveyResponseSchema,
+    SurveySchema,
+)
+from app.routes.schemas.user_schemas import UserSchema
+from app.utils.responses import FastJSONResponse
+
+
+def build_surveys(rows: int):
+    authors = [
+        User(email=f"author{i}@loslc.io", username=f"author{i}", account_type="admin")
+        for i in range(10)
+    ]
+    surveys = []
+    for i in range(rows):
+        survey = Survey(
+            id=uuid.uuid4(),
+            title=f"Survey {i}",
+            description="A survey about open-source tooling " * 3,
+            active=True,
+            author_email=authors[i % 10].email,
+        )
+        survey.author = authors[i % 10]
+        surveys.append(survey)
+    return surveys
+
+
+def build_responses(rows: int):
+    question = SurveyQuestion(id=uuid.uuid4(), title="Q", question_type="multiselect")
+    responses = []
+    for i in range(rows):
+        response = SurveyResponse(
+            id=uuid.uuid4(),
+            survey_id=uuid.uuid4(),
+            question_id=question.id,
+            responder_email=f"user{i}@loslc.io",
+            values=["linux", "bsd", "gnu"],
+        )
+        response.question = question
+        responses.append(response)
+    return responses
+
+
+def generic_survey_schema(survey: Survey):
+    return SurveySchema(
+        id=str(survey.id),
+        title=survey.title,
+        description=survey.description,
+        active=survey.active,
+        author=UserSchema.from_model(survey.author),
+    )
+
+
+def generic_render(items):
+    return JSONResponse(jsonable_encoder(Page(items=items))).body
+
+
+def fast_render(items):
+    return FastJSONResponse(Page(items=items)).body
+
+
+def measure(label: str, func, rows: int, repeat: int):
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<40}{seconds * 1e6 / rows:>10.2f} us/row")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    surveys = build_surveys(args.rows)
+    responses = build_responses(args.rows)
+    assert generic_render([generic_survey_schema(s) for s in surveys]) == fast_render(
+        [SurveySchema.from_model(s) for s in surveys]
+    )
+
+    for name, generic, fast in (
+        (
+            "surveys",
+            lambda: generic_render([generic_survey_schema(s) for s in surveys]),
+            lambda: fast_render([SurveySchema.from_model(s) for s in surveys]),
+        ),
+        (
+            "responses",
+            lambda: generic_render(
+                [SurveyResponseSchema.from_model(r) for r in responses]
+            ),
+            lambda: fast_render(
+                [SurveyResponseSchema.from_model(r) for r in responses]
+            ),
+        ),
+    ):
+        print(f"{name} ({args.rows} rows)")
+        before = measure(
+            "  schemas + jsonable_encoder + json", generic, args.rows, args.repeat
+        )
+        after = measure(
+            "  from_attributes + pydantic-core", fast, args.rows, args.repeat
+        )
+        print(f"  speedup {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
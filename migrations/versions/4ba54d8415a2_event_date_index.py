@@ -0,0 +1,31 @@
+"""event date index
+
+Revision ID: 4ba54d8415a2
+Revises: cc903ae844fb
+Create Date: 2026-10-18 06:00:18.254523
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4ba54d8415a2'
+down_revision: Union[str, None] = 'cc903ae844fb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_event_date_id', 'event', ['date', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_event_date_id', table_name='event', postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+"""unique response per responder
+
+Revision ID: 55e96b08d086
+Revises: 5c6c36998649
+Create Date: 2026-10-18 06:37:01.992700
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '55e96b08d086'
+down_revision: Union[str, None] = '5c6c36998649'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the index without blocking writes, then turn it into the
+    # constraint; every row already satisfies it since question_id alone was
+    # unique until now.
+    with op.get_context().autocommit_block():
+        op.create_index('surveyresponse_question_id_responder_email_key', 'surveyresponse', ['question_id', 'responder_email'], unique=True, postgresql_concurrently=True)
+    op.execute('ALTER TABLE surveyresponse ADD CONSTRAINT surveyresponse_question_id_responder_email_key UNIQUE USING INDEX surveyresponse_question_id_responder_email_key')
+    op.drop_constraint('surveyresponse_question_id_key', 'surveyresponse', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('surveyresponse_question_id_key', 'surveyresponse', ['question_id'])
+    op.drop_constraint('surveyresponse_question_id_responder_email_key', 'surveyresponse', type_='unique')
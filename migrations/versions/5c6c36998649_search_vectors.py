@@ -0,0 +1,39 @@
+"""search vectors
+
+Revision ID: 5c6c36998649
+Revises: 4d074544360c
+Create Date: 2026-10-18 06:06:57.612432
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5c6c36998649'
+down_revision: Union[str, None] = '4d074544360c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored generated columns rewrite both tables once; the GIN indexes are
+    # then built without blocking writes.
+    op.add_column('event', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('english', coalesce(title, '')), 'A') || setweight(to_tsvector('english', coalesce(location, '')), 'B') || setweight(to_tsvector('english', coalesce(description, '')), 'C')", persisted=True), nullable=True))
+    op.add_column('survey', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('english', coalesce(title, '')), 'A') || setweight(to_tsvector('english', coalesce(description, '')), 'B')", persisted=True), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_event_search_vector', 'event', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_survey_search_vector', 'survey', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_survey_search_vector', table_name='survey', postgresql_using='gin', postgresql_concurrently=True)
+        op.drop_index('ix_event_search_vector', table_name='event', postgresql_using='gin', postgresql_concurrently=True)
+    op.drop_column('survey', 'search_vector')
+    op.drop_column('event', 'search_vector')
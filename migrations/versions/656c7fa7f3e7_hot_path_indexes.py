@@ -0,0 +1,45 @@
+"""hot path indexes
+
+Revision ID: 656c7fa7f3e7
+Revises: d35b754cffa2
+Create Date: 2026-10-18 05:42:00.637476
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '656c7fa7f3e7'
+down_revision: Union[str, None] = 'd35b754cffa2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so a live database keeps accepting writes while the
+    # indexes are created.
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_authsession_user_email'), 'authsession', ['user_email'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_loginsession_user_email'), 'loginsession', ['user_email'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_survey_active_id', 'survey', ['id'], unique=False, postgresql_where=sa.text('active'), postgresql_concurrently=True)
+        op.create_index(op.f('ix_surveyanswercount_survey_id'), 'surveyanswercount', ['survey_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_surveyquestion_survey_id'), 'surveyquestion', ['survey_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_surveyresponse_responder_email'), 'surveyresponse', ['responder_email'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_surveyresponse_survey_id_id', 'surveyresponse', ['survey_id', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_surveyresponse_survey_id_id', table_name='surveyresponse', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_surveyresponse_responder_email'), table_name='surveyresponse', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_surveyquestion_survey_id'), table_name='surveyquestion', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_surveyanswercount_survey_id'), table_name='surveyanswercount', postgresql_concurrently=True)
+        op.drop_index('ix_survey_active_id', table_name='survey', postgresql_where=sa.text('active'), postgresql_concurrently=True)
+        op.drop_index(op.f('ix_loginsession_user_email'), table_name='loginsession', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_authsession_user_email'), table_name='authsession', postgresql_concurrently=True)
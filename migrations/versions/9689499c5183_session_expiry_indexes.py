@@ -0,0 +1,35 @@
+"""session expiry indexes
+
+Revision ID: 9689499c5183
+Revises: 656c7fa7f3e7
+Create Date: 2026-10-18 05:43:04.341108
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9689499c5183'
+down_revision: Union[str, None] = '656c7fa7f3e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_authsession_expires_at'), 'authsession', ['expires_at'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_loginsession_expires_at'), 'loginsession', ['expires_at'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_revokedsession_expires_at'), 'revokedsession', ['expires_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_revokedsession_expires_at'), table_name='revokedsession', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_loginsession_expires_at'), table_name='loginsession', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_authsession_expires_at'), table_name='authsession', postgresql_concurrently=True)
@@ -0,0 +1,34 @@
+"""outbox retry schedule
+
+Revision ID: c4c27091aa5e
+Revises: 55e96b08d086
+Create Date: 2026-10-18 06:43:17.004959
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4c27091aa5e'
+down_revision: Union[str, None] = '55e96b08d086'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Emails already queued are due straight away.
+    op.add_column('outboxemail', sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=sa.func.now()))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_outboxemail_due', 'outboxemail', ['next_attempt_at'], unique=False, postgresql_where=sa.text("status = 'pending'"), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_outboxemail_due', table_name='outboxemail', postgresql_where=sa.text("status = 'pending'"), postgresql_concurrently=True)
+    op.drop_column('outboxemail', 'next_attempt_at')
@@ -0,0 +1,9 @@
+import asyncio
+
+from app.db.database import async_session_maker
+from app.services.sweeper import sweep_expired_sessions
+
+if __name__ == "__main__":
+    reclaimed = asyncio.run(sweep_expired_sessions(async_session_maker))
+    for table, rows in reclaimed.items():
+        print(f"{table}: {rows} expired rows deleted")
@@ -0,0 +1,131 @@
+"""Fixtures for tests that run against a real Postgres database.
+
+Point TEST_DB_STRING at a scratch database; it is wiped at the start of the
+session and truncated before every test. Without it every test is skipped.
+
+    TEST_DB_STRING=postgresql://... python -m pytest
+"""
+
+import os
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+TEST_DB_STRING = os.getenv("TEST_DB_STRING")
+# Set before anything imports app.env, so that the app never sees the
+# settings of a .env file meant for development.
+os.environ["DB_STRING"] = TEST_DB_STRING or "postgresql://localhost/unused"
+# Outbox tests deliver to a local aiosmtpd server.
+os.environ["EMAIL_ADDRESS"] = "noreply@test.loslc.io"
+os.environ["SMTP_HOST"] = "127.0.0.1"
+os.environ["SMTP_PORT"] = os.getenv("TEST_SMTP_PORT", "8026")
+os.environ["SMTP_USE_SSL"] = "false"
+os.environ["SMTP_USERNAME"] = ""
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, inspect, text  # noqa: E402
+
+from app.app import app  # noqa: E402
+from app.db.database import async_engine, engine, setup_db  # noqa: E402
+from app.db.models import AuthSession, User  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def database():
+    if not TEST_DB_STRING:
+        pytest.skip("TEST_DB_STRING is not set")
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+    setup_db()
+    with engine.connect() as connection:
+        tables = [
+            table
+            for table in inspect(connection).get_table_names()
+            if table != "alembic_version"
+        ]
+    yield tables
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+async def clean_database(database: list[str]):
+    tables = ", ".join(f'"{table}"' for table in database)
+    with engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {tables} CASCADE"))
+    yield
+    # Pooled connections belong to the event loop of the test that opened
+    # them.
+    await async_engine.dispose()
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def sign_in():
+    """Creates a user with a live session and returns the headers to send."""
+
+    def sign_in(email: str, account_type: str = "user"):
+        session_id = uuid4().hex
+        with engine.begin() as connection:
+            connection.execute(
+                insert(User).values(
+                    email=email,
+                    id=uuid4(),
+                    username=email.split("@")[0],
+                    account_type=account_type,
+                )
+            )
+            connection.execute(
+                insert(AuthSession).values(
+                    id=session_id,
+                    user_email=email,
+                    expires_at=datetime.now() + timedelta(days=1),
+                )
+            )
+        return {"Cookie": f"session={session_id}"}
+
+    return sign_in
+
+
+@pytest.fixture
+def admin(sign_in):
+    return sign_in("admin@test.loslc.io", "admin")
+
+
+@pytest.fixture
+async def survey(client: httpx.AsyncClient, admin: dict[str, str]):
+    """An active survey with a select, a multiselect and a text question."""
+    response = await client.post(
+        "/v1/survey/create/nested",
+        headers=admin,
+        json={
+            "title": "Favourite distribution",
+            "description": "Tell us what you run",
+            "active": True,
+            "author": {
+                "username": "admin",
+                "email": "admin@test.loslc.io",
+                "account_type": "admin",
+            },
+            "questions": [
+                {"title": "Distribution", "question_type": "select"},
+                {"title": "Desktops", "question_type": "multiselect"},
+                {"title": "Why", "question_type": "text"},
+            ],
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from app.db.database import async_session_maker, engine
+from app.db.models import OutboxEmail
+from app.services.email import EmailOutbox
+
+pytestmark = pytest.mark.anyio
+
+
+class MailSink:
+    """aiosmtpd handler that records deliveries and refuses some recipients."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.delivered: list[str] = []
+        # Recipient -> number of deliveries to refuse before accepting.
+        self.refuse: dict[str, int] = {}
+
+    async def handle_DATA(self, server, session, envelope):
+        with self.lock:
+            for address in envelope.rcpt_tos:
+                if self.refuse.get(address, 0) > 0:
+                    self.refuse[address] -= 1
+                    return "451 Try again later"
+            self.delivered.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+
+@pytest.fixture
+def mail_sink():
+    sink = MailSink()
+    controller = Controller(
+        sink, hostname=os.environ["SMTP_HOST"], port=int(os.environ["SMTP_PORT"])
+    )
+    controller.start()
+    yield sink
+    controller.stop()
+
+
+def queue(*recipients: str, **values):
+    with engine.begin() as connection:
+        connection.execute(
+            insert(OutboxEmail),
+            [
+                {"recipient": recipient, "subject": "Hi", "message": "Hello"} | values
+                for recipient in recipients
+            ],
+        )
+
+
+def outbox_emails():
+    with Session(engine) as db_session:
+        emails = db_session.exec(select(OutboxEmail)).all()
+    return {email.recipient: email for email in emails}
+
+
+async def wait_until(condition, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+def outbox(**options):
+    return EmailOutbox(
+        **{"workers": 3, "batch_size": 5, "poll_seconds": 0.05} | options
+    )
+
+
+async def test_concurrent_outboxes_send_each_email_once(mail_sink: MailSink):
+    recipients = [f"user{i}@test.loslc.io" for i in range(40)]
+    queue(*recipients)
+    # Two processes that both start with the same pending emails.
+    outboxes = [outbox(), outbox()]
+    for each in outboxes:
+        await each.start(async_session_maker)
+
+    await wait_until(
+        lambda: all(email.status == "sent" for email in outbox_emails().values())
+    )
+    for each in outboxes:
+        await each.stop()
+
+    assert Counter(mail_sink.delivered) == Counter(recipients)
+    assert {email.attempts for email in outbox_emails().values()} == {1}
+
+
+async def test_start_respects_backoff(mail_sink: MailSink):
+    queue("due@test.loslc.io")
+    queue(
+        "later@test.loslc.io",
+        attempts=1,
+        next_attempt_at=datetime.now() + timedelta(hours=1),
+    )
+    each = outbox()
+    await each.start(async_session_maker)
+
+    await wait_until(lambda: mail_sink.delivered == ["due@test.loslc.io"])
+    await asyncio.sleep(0.2)
+    await each.stop()
+
+    assert mail_sink.delivered == ["due@test.loslc.io"]
+    later = outbox_emails()["later@test.loslc.io"]
+    assert (later.status, later.attempts) == ("pending", 1)
+
+
+async def test_email_locked_by_another_process_is_skipped(mail_sink: MailSink):
+    queue("locked@test.loslc.io")
+    each = outbox()
+    with engine.connect() as connection:
+        # Another process in the middle of sending it.
+        connection.execute(select(OutboxEmail).with_for_update())
+        await each.start(async_session_maker)
+        await asyncio.sleep(0.3)
+        assert mail_sink.delivered == []
+        connection.rollback()
+
+    await wait_until(lambda: mail_sink.delivered == ["locked@test.loslc.io"])
+    await each.stop()
+
+    locked = outbox_emails()["locked@test.loslc.io"]
+    assert (locked.status, locked.attempts) == ("sent", 1)
+
+
+async def test_refused_email_is_retried_after_a_delay(mail_sink: MailSink):
+    mail_sink.refuse["flaky@test.loslc.io"] = 1
+    queue("flaky@test.loslc.io")
+    each = outbox(retry_base_seconds=0.5)
+    await each.start(async_session_maker)
+
+    await wait_until(lambda: outbox_emails()["flaky@test.loslc.io"].attempts == 1)
+    await wait_until(lambda: outbox_emails()["flaky@test.loslc.io"].status == "pending")
+    flaky = outbox_emails()["flaky@test.loslc.io"]
+    assert flaky.last_error
+    assert flaky.next_attempt_at > datetime.now()
+    assert mail_sink.delivered == []
+
+    await wait_until(lambda: mail_sink.delivered == ["flaky@test.loslc.io"])
+    await each.stop()
+    flaky = outbox_emails()["flaky@test.loslc.io"]
+    assert (flaky.status, flaky.attempts, flaky.last_error) == ("sent", 2, None)
+
+
+async def test_email_fails_after_max_attempts(mail_sink: MailSink):
+    mail_sink.refuse["broken@test.loslc.io"] = 10
+    queue("broken@test.loslc.io")
+    each = outbox(max_attempts=3, retry_base_seconds=0.05)
+    await each.start(async_session_maker)
+
+    await wait_until(lambda: outbox_emails()["broken@test.loslc.io"].status == "failed")
+    await each.stop()
+
+    broken = outbox_emails()["broken@test.loslc.io"]
+    assert broken.attempts == 3
+    assert mail_sink.refuse["broken@test.loslc.io"] == 7
+    assert mail_sink.delivered == []
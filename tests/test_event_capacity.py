@@ -0,0 +1,108 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.database import engine
+from app.db.models import Event, EventUserLink, EventWaitlist
+
+pytestmark = pytest.mark.anyio
+
+CAPACITY = 5
+
+
+@pytest.fixture
+async def event(client, admin):
+    response = await client.post(
+        "/v1/event/create",
+        headers=admin,
+        json={
+            "title": "Install party",
+            "description": "Bring your laptop",
+            "date": (datetime.now() + timedelta(days=7)).isoformat(),
+            "location": "Lab",
+            "cover_image_url": "https://loslc.io/cover.png",
+            "capacity": CAPACITY,
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def seats(event_id: str):
+    with engine.connect() as connection:
+        participant_count = connection.execute(
+            select(Event.participant_count).where(Event.id == event_id)
+        ).scalar_one()
+        participants = connection.execute(
+            select(func.count()).where(EventUserLink.event_id == event_id)
+        ).scalar_one()
+        waitlisted = connection.execute(
+            select(func.count()).where(EventWaitlist.event_id == event_id)
+        ).scalar_one()
+    return participant_count, participants, waitlisted
+
+
+async def watch_capacity(event_id: str, stop: asyncio.Event):
+    """Samples the seats while requests run; returns the most ever taken."""
+    most = 0
+    while not stop.is_set():
+        participant_count, participants, _ = await asyncio.to_thread(seats, event_id)
+        most = max(most, participant_count, participants)
+        await asyncio.sleep(0.005)
+    return most
+
+
+async def hammer(event_id: str, requests):
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_capacity(event_id, stop))
+    responses = await asyncio.gather(*requests)
+    stop.set()
+    return responses, await watcher
+
+
+def users(sign_in, name: str, count: int):
+    return [sign_in(f"{name}{i}@test.loslc.io") for i in range(count)]
+
+
+async def test_concurrent_joins_never_exceed_capacity(client, sign_in, event):
+    joiners = users(sign_in, "joiner", 40)
+
+    responses, most = await hammer(
+        event["id"],
+        [
+            client.post(f"/v1/events/{event['id']}/join", headers=headers)
+            for headers in joiners
+        ],
+    )
+
+    assert Counter(response.json()["status"] for response in responses) == {
+        "joined": CAPACITY,
+        "waitlisted": len(joiners) - CAPACITY,
+    }
+    assert most <= CAPACITY
+    assert seats(event["id"]) == (CAPACITY, CAPACITY, len(joiners) - CAPACITY)
+
+
+async def test_leaving_promotes_the_waitlist_under_contention(client, sign_in, event):
+    participants = users(sign_in, "participant", CAPACITY)
+    for headers in participants:
+        joined = await client.post(f"/v1/events/{event['id']}/join", headers=headers)
+        assert joined.json()["status"] == "joined"
+    joiners = users(sign_in, "joiner", 30)
+
+    responses, most = await hammer(
+        event["id"],
+        [
+            client.post(f"/v1/events/{event['id']}/{action}", headers=headers)
+            for action, headers in [("leave", headers) for headers in participants]
+            + [("join", headers) for headers in joiners]
+        ],
+    )
+
+    assert all(response.status_code in (200, 202) for response in responses)
+    assert most <= CAPACITY
+    # Every seat freed went to someone who was waiting or joining.
+    assert seats(event["id"]) == (CAPACITY, CAPACITY, len(joiners) - CAPACITY)
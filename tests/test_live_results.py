@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+import uvicorn
+
+from app.app import app
+from app.routes.services import survey_results_service
+from app.services.live_results import live_results
+
+pytestmark = pytest.mark.anyio
+
+MIN_INTERVAL = 0.5
+
+
+@pytest.fixture
+async def server(monkeypatch):
+    """The app served over a real socket, since streams need a live
+    connection, with its lifespan (and so the LISTEN connection) running."""
+    monkeypatch.setattr(live_results, "min_interval", MIN_INTERVAL)
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="127.0.0.1", port=0, log_level="warning", lifespan="on"
+        )
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        yield client
+    server.should_exit = True
+    await serving
+
+
+async def read_events(stream: httpx.Response, events: list):
+    async for line in stream.aiter_lines():
+        if line.startswith("data: "):
+            events.append((time.monotonic(), json.loads(line.removeprefix("data: "))))
+
+
+def tally(payload: list[dict]):
+    return payload[0]["answers"]
+
+
+async def wait_until(condition, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+async def test_stream_pushes_coalesced_tallies(
+    server, client, sign_in, admin, survey, monkeypatch
+):
+    loads: list[float] = []
+    load = survey_results_service.load_live_survey_results
+
+    async def timed_load(key: str):
+        loads.append(time.monotonic())
+        return await load(key)
+
+    monkeypatch.setattr(survey_results_service, "load_live_survey_results", timed_load)
+    url = f"/v1/surveys/{survey['id']}/results/stream"
+    question = survey["questions"][0]
+    responders = [sign_in(f"user{i}@test.loslc.io") for i in range(30)]
+    seen: list[list] = [[], []]
+
+    async with (
+        server.stream("GET", url, headers=admin) as first,
+        server.stream("GET", url, headers=admin) as second,
+    ):
+        assert first.headers["content-type"].startswith("text/event-stream")
+        readers = [
+            asyncio.create_task(read_events(stream, events))
+            for stream, events in zip((first, second), seen)
+        ]
+        await wait_until(lambda: all(seen))
+        assert live_results.stats()["subscribers"] == 2
+        notifications, pushes = live_results.notifications, live_results.pushes
+        snapshots = len(loads)
+
+        # Three bursts of ten submissions, faster than the push interval.
+        for burst in range(3):
+            await asyncio.gather(
+                *(
+                    client.post(
+                        f"/v1/surveys/{survey['id']}/responses",
+                        headers=headers,
+                        json={
+                            "answers": [
+                                {"question_id": question["id"], "answers": [answer]}
+                            ]
+                        },
+                    )
+                    for headers, answer in zip(
+                        responders[burst * 10 : burst * 10 + 10],
+                        ["debian", "arch", "fedora"] * 4,
+                    )
+                )
+            )
+            await asyncio.sleep(0.1)
+        final = {"debian": 12, "arch": 9, "fedora": 9}
+        await wait_until(lambda: all(tally(events[-1][1]) == final for events in seen))
+        for reader in readers:
+            reader.cancel()
+
+    events = seen[0]
+    assert tally(events[0][1]) == {}
+    # The tallies are loaded at most once per interval for both subscribers,
+    # which get the same updates.
+    pushed = loads[snapshots:]
+    assert all(b - a >= MIN_INTERVAL - 0.01 for a, b in zip(pushed, pushed[1:]))
+    assert [payload for _, payload in seen[1]] == [payload for _, payload in events]
+    assert 1 <= len(events) - 1 == live_results.pushes - pushes <= len(pushed)
+    assert len(pushed) < live_results.notifications - notifications
@@ -0,0 +1,36 @@
+import pytest
+
+from app.utils.pagination import encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        encode_cursor(5),
+        encode_cursor(None),
+        encode_cursor({"id": 1}),
+        encode_cursor([1, 2, 3]),
+        encode_cursor(["tomorrow", 5]),
+    ],
+)
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/v1/surveys", {}),
+        ("/v1/surveys/{survey_id}/responses", {}),
+        ("/v1/events", {}),
+        ("/v1/search", {"q": "distribution"}),
+    ],
+)
+async def test_malformed_cursor_is_a_400(client, admin, survey, path, params, cursor):
+    response = await client.get(
+        path.format(survey_id=survey["id"]),
+        headers=admin,
+        params=params | {"cursor": cursor},
+    )
+
+    assert response.status_code == 400, response.text
+    assert response.json() == {"detail": "Invalid cursor"}
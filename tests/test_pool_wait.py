@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import exc
+
+from app.db import database
+from app.db.database import pool_wait_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cached_session_checks_out_no_connection(client, sign_in, survey):
+    alice = sign_in("alice@test.loslc.io")
+    url = f"/v1/surveys/{survey['id']}/responses"
+    # The first request looks the session up and caches the user.
+    assert (await client.get(url, headers=alice)).status_code == 403
+    checkouts = pool_wait_stats.checkouts
+
+    response = await client.get(url, headers=alice)
+
+    assert response.status_code == 403
+    assert pool_wait_stats.checkouts == checkouts
+
+
+async def test_query_records_the_pool_wait(client, admin, survey):
+    checkouts = pool_wait_stats.checkouts
+
+    response = await client.get(f"/v1/surveys/{survey['id']}/responses", headers=admin)
+
+    assert response.status_code == 200
+    assert pool_wait_stats.checkouts > checkouts
+    assert "pool;dur=" in response.headers["Server-Timing"]
+
+
+async def test_pool_timeout_is_a_503(client, admin, survey, monkeypatch):
+    def no_connection(pool):
+        raise exc.TimeoutError("QueuePool limit reached")
+
+    monkeypatch.setattr(database.AsyncAdaptedQueuePool, "connect", no_connection)
+    timeouts = pool_wait_stats.timeouts
+
+    response = await client.get(f"/v1/surveys/{survey['id']}/responses", headers=admin)
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Database busy"}
+    assert pool_wait_stats.timeouts == timeouts + 1
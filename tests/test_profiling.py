@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from app.services import profiling
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch):
+    pytest.importorskip("pyinstrument")
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+
+
+async def test_disabled_by_default(client, admin, survey):
+    response = await client.get(
+        f"/v1/surveys/{survey['id']}", headers=admin | {"X-Profile": "html"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+
+async def test_admin_gets_the_profile(client, admin, survey, profiling_enabled):
+    response = await client.get(
+        f"/v1/surveys/{survey['id']}", headers=admin | {"X-Profile": "speedscope"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    assert "speedscope" in response.json()["$schema"]
+
+
+async def test_no_session_is_not_looked_up(
+    client, survey, profiling_enabled, monkeypatch
+):
+    def no_database_session():
+        raise AssertionError("opened a database session")
+
+    monkeypatch.setattr(profiling, "async_session_maker", no_database_session)
+
+    response = await client.get(
+        f"/v1/surveys/{survey['id']}", headers={"X-Profile": "html"}
+    )
+
+    assert response.status_code == 401
+
+
+async def test_streaming_responses_are_not_profiled(
+    client, sign_in, admin, survey, profiling_enabled
+):
+    question = survey["questions"][0]
+    answered = await client.post(
+        f"/v1/surveys/{survey['id']}/responses",
+        headers=sign_in("alice@test.loslc.io"),
+        json={"answers": [{"question_id": question["id"], "answers": ["debian"]}]},
+    )
+    assert answered.status_code == 201, answered.text
+
+    response = await client.get(
+        f"/v1/surveys/{survey['id']}/responses/export",
+        headers=admin | {"X-Profile": "html"},
+        params={"format": "ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert "x-profiled-status" not in response.headers
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["answers"] for row in rows] == [["debian"]]
@@ -0,0 +1,196 @@
+"""EXPLAIN the hot queries against a realistic volume of rows and check that
+every table they filter is read through an index.
+
+The statements come from the same builders the services execute, so a change
+to a query is checked here as soon as it is made.
+"""
+
+import hashlib
+from uuid import UUID
+
+import pytest
+from sqlalchemy import text
+
+from app.auth.auth_service import delete_user_sessions_stmt
+from app.db.database import engine
+from app.db.models import AuthSession, LoginSession
+from app.env import DEFAULT_PAGE_SIZE, SWEEP_BATCH_SIZE
+from app.routes.services.survey_results_service import (
+    answer_counts_stmt,
+    answer_frequencies_stmt,
+)
+from app.routes.services.survey_service import (
+    answered_questions_stmt,
+    survey_questions_stmt,
+    survey_responses_stmt,
+    surveys_stmt,
+)
+from app.services.sweeper import sweep_batch_stmt
+
+pytestmark = pytest.mark.anyio
+
+USERS = 2000
+SURVEYS = 2000
+QUESTIONS_PER_SURVEY = 10
+# Responses are seeded for the questions of the first surveys only.
+ANSWERED_SURVEYS = 500
+RESPONSES_PER_QUESTION = 5
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+SEED = [
+    """
+    INSERT INTO "user" (email, id, username, account_type)
+    SELECT 'user' || i || '@plans.loslc.io', gen_random_uuid(), 'user' || i, 'user'
+    FROM generate_series(0, :users - 1) AS i
+    """,
+    """
+    INSERT INTO authsession (id, user_email, expires_at)
+    SELECT md5(random()::text), 'user' || (i % :users) || '@plans.loslc.io',
+        now() + interval '1 day'
+    FROM generate_series(1, :users * 3) AS i
+    """,
+    """
+    INSERT INTO loginsession (id, user_email, expires_at)
+    SELECT md5(random()::text), 'user' || (i % :users) || '@plans.loslc.io',
+        now() + interval '1 hour'
+    FROM generate_series(1, :users * 3) AS i
+    """,
+    # Surveys get ids in creation order (i), and one in ten is active.
+    """
+    INSERT INTO survey (id, author_email, title, description, active, version)
+    SELECT md5(i::text)::uuid, 'user0@plans.loslc.io', 'Survey ' || i, '',
+        i % 10 = 0, 1
+    FROM generate_series(0, :surveys - 1) AS i
+    """,
+    """
+    INSERT INTO surveyquestion (id, survey_id, author_email, question_type, title)
+    SELECT md5(s || '-' || q)::uuid, md5(s::text)::uuid, 'user0@plans.loslc.io',
+        (ARRAY['select', 'multiselect', 'text'])[1 + q % 3], 'Question ' || q
+    FROM generate_series(0, :surveys - 1) AS s,
+        generate_series(0, :questions - 1) AS q
+    """,
+    """
+    INSERT INTO surveyresponse (id, responder_email, question_id, survey_id, values)
+    SELECT gen_random_uuid(),
+        'user' || ((s * :questions + q) * :responses + r) % :users
+            || '@plans.loslc.io',
+        md5(s || '-' || q)::uuid, md5(s::text)::uuid, ARRAY['a', 'b']
+    FROM generate_series(0, :answered - 1) AS s,
+        generate_series(0, :questions - 1) AS q,
+        generate_series(0, :responses - 1) AS r
+    """,
+    """
+    INSERT INTO surveyanswercount (question_id, value, survey_id, count)
+    SELECT md5(s || '-' || q)::uuid, v, md5(s::text)::uuid, :responses
+    FROM generate_series(0, :answered - 1) AS s,
+        generate_series(0, :questions - 1) AS q,
+        unnest(ARRAY['a', 'b']) AS v
+    """,
+]
+
+
+def md5_uuid(value: str):
+    # Same as md5(value)::uuid in the seed.
+    return UUID(hashlib.md5(value.encode()).hexdigest())
+
+
+def survey_id(survey: int):
+    return md5_uuid(str(survey))
+
+
+def question_id(survey: int, question: int):
+    return md5_uuid(f"{survey}-{question}")
+
+
+@pytest.fixture
+def seeded():
+    with engine.begin() as connection:
+        for statement in SEED:
+            connection.execute(
+                text(statement),
+                {
+                    "users": USERS,
+                    "surveys": SURVEYS,
+                    "questions": QUESTIONS_PER_SURVEY,
+                    "answered": ANSWERED_SURVEYS,
+                    "responses": RESPONSES_PER_QUESTION,
+                },
+            )
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+
+
+def scans(plan: dict):
+    if plan["Node Type"].endswith("Scan") and "Relation Name" in plan:
+        yield plan["Relation Name"], plan["Node Type"]
+    for child in plan.get("Plans", ()):
+        yield from scans(child)
+
+
+def explain(stmt):
+    sql = stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+        connection.rollback()
+    return list(scans(plan[0]["Plan"]))
+
+
+HOT_QUERIES = {
+    "active survey listing": (
+        lambda: surveys_stmt(True).limit(DEFAULT_PAGE_SIZE + 1),
+        "survey",
+    ),
+    "active survey listing, next page": (
+        lambda: surveys_stmt(True, survey_id(1000)).limit(DEFAULT_PAGE_SIZE + 1),
+        "survey",
+    ),
+    "survey questions": (
+        lambda: survey_questions_stmt(survey_id(10)),
+        "surveyquestion",
+    ),
+    "response page": (
+        lambda: survey_responses_stmt(survey_id(10)).limit(DEFAULT_PAGE_SIZE + 1),
+        "surveyresponse",
+    ),
+    "response page, next page": (
+        lambda: survey_responses_stmt(survey_id(10), md5_uuid("middle")).limit(
+            DEFAULT_PAGE_SIZE + 1
+        ),
+        "surveyresponse",
+    ),
+    "already answered check": (
+        lambda: answered_questions_stmt(
+            "user7@plans.loslc.io",
+            [question_id(10, q) for q in range(QUESTIONS_PER_SURVEY)],
+        ),
+        "surveyresponse",
+    ),
+    "answer counts": (
+        lambda: answer_counts_stmt(survey_id(10)),
+        "surveyanswercount",
+    ),
+    "answer frequencies of an inactive survey": (
+        lambda: answer_frequencies_stmt(survey_id(11)),
+        "surveyresponse",
+    ),
+    "revoke user sessions": (
+        lambda: delete_user_sessions_stmt("user7@plans.loslc.io"),
+        "authsession",
+    ),
+    "sweep expired auth sessions": (
+        lambda: sweep_batch_stmt(AuthSession, SWEEP_BATCH_SIZE),
+        "authsession",
+    ),
+    "sweep expired login sessions": (
+        lambda: sweep_batch_stmt(LoginSession, SWEEP_BATCH_SIZE),
+        "loginsession",
+    ),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+async def test_hot_query_uses_an_index(seeded, name: str):
+    build, table = HOT_QUERIES[name]
+    nodes = [node for relation, node in explain(build()) if relation == table]
+    assert nodes, f"{name} does not read {table}"
+    assert set(nodes) <= INDEX_SCANS, f"{name} reads {table} with {nodes}"
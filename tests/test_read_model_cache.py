@@ -0,0 +1,231 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from app.db.database import async_engine
+from app.services.cache import (
+    MemoryCacheBackend,
+    ReadModelCache,
+    RedisCacheBackend,
+    read_model_cache,
+    survey_cache_key,
+    survey_questions_cache_key,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def counting_loader(calls: list[str], value: str, delay: float = 0):
+    async def load():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return value
+
+    return load
+
+
+async def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_size=2)
+    await backend.set("a", "1", 60)
+    await backend.set("b", "2", 60)
+    await backend.get("a")
+    await backend.set("c", "3", 60)
+
+    assert [await backend.get(key) for key in "abc"] == ["1", None, "3"]
+
+
+@pytest.fixture
+def redis_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    return lambda: RedisCacheBackend(fakeredis.FakeAsyncRedis(server=server))
+
+
+async def next_message(subscription):
+    return await asyncio.wait_for(anext(subscription), timeout=1)
+
+
+async def test_redis_backend(redis_server):
+    backend = redis_server()
+    await backend.set("a", "1", 60)
+    await backend.set("short", "2", 0.05)
+
+    assert await backend.get("a") == "1"
+    assert not await backend.add("a", "other", 60)
+    assert await backend.add("b", "3", 0.05)
+    assert await backend.get("b") == "3"
+    await asyncio.sleep(0.1)
+    assert await backend.get("b") is None
+    assert await backend.get("short") is None
+    assert await backend.add("b", "4", 60)
+    await backend.delete("a", "b")
+    assert [await backend.get(key) for key in "ab"] == [None, None]
+    await backend.close()
+
+
+async def test_redis_backend_publishes_to_subscribers(redis_server):
+    publisher, subscriber = redis_server(), redis_server()
+    subscription = subscriber.subscribe()
+    first = asyncio.create_task(next_message(subscription))
+    # Publish until the subscription is set up; earlier messages are lost.
+    while not first.done():
+        await publisher.publish("hello")
+        await asyncio.sleep(0.01)
+
+    assert first.result() == "hello"
+    await subscription.aclose()
+    await publisher.close()
+    await subscriber.close()
+
+
+async def test_invalidation_drops_other_workers_local_copies(redis_server):
+    writer, reader = (
+        ReadModelCache(redis_server(), ttl=60, local_ttl=60, redelete_delay=0)
+        for _ in range(2)
+    )
+    calls: list[str] = []
+    await reader.get_or_load("key", counting_loader(calls, "old"))
+    listener = asyncio.create_task(reader.listen())
+    await asyncio.sleep(0.05)
+
+    await writer.invalidate("key")
+    for _ in range(100):
+        if reader.stats()["local_size"] == 0:
+            break
+        await asyncio.sleep(0.01)
+    value = await reader.get_or_load("key", counting_loader(calls, "new"))
+
+    listener.cancel()
+    assert value == "new"
+    assert calls == ["old", "new"]
+
+
+async def test_local_tier_is_bounded():
+    cache = ReadModelCache(MemoryCacheBackend(), ttl=60, local_ttl=60, local_max_size=2)
+    calls: list[str] = []
+    for key in "abc":
+        await cache.get_or_load(key, counting_loader(calls, key))
+
+    stats = cache.stats()
+    assert (stats["local_size"], stats["evictions"]) == (2, 1)
+
+
+async def test_invalidations_leave_nothing_behind():
+    cache = ReadModelCache(MemoryCacheBackend(), ttl=60, local_ttl=60, redelete_delay=0)
+    calls: list[str] = []
+    for i in range(100):
+        await cache.get_or_load(f"key{i}", counting_loader(calls, "value"))
+        await cache.invalidate(f"key{i}")
+    await asyncio.sleep(0)
+
+    assert cache.stats()["local_size"] == 0
+    assert not cache._stale
+
+
+async def test_workers_sharing_a_backend_load_a_missing_key_once():
+    backend = MemoryCacheBackend()
+    workers = [
+        ReadModelCache(backend, ttl=60, local_ttl=60, load_poll_interval=0.01)
+        for _ in range(3)
+    ]
+    calls: list[str] = []
+
+    values = await asyncio.gather(
+        *(
+            worker.get_or_load("key", counting_loader(calls, "value", delay=0.1))
+            for worker in workers
+            for _ in range(5)
+        )
+    )
+
+    assert set(values) == {"value"}
+    assert calls == ["value"]
+
+
+async def test_waiting_worker_loads_when_the_holder_stores_nothing():
+    backend = MemoryCacheBackend()
+    holder, waiter = (
+        ReadModelCache(backend, ttl=60, local_ttl=60, load_poll_interval=0.01)
+        for _ in range(2)
+    )
+    calls: list[str] = []
+
+    async def invalidated_mid_load():
+        await asyncio.sleep(0.02)
+        await holder.invalidate("key")
+
+    values = await asyncio.gather(
+        holder.get_or_load("key", counting_loader(calls, "old", delay=0.05)),
+        waiter.get_or_load("key", counting_loader(calls, "new", delay=0.05)),
+        invalidated_mid_load(),
+    )
+
+    assert values[:2] == ["old", "new"]
+    assert calls == ["old", "new"]
+    assert await backend.get("key") == "new"
+
+
+@pytest.mark.parametrize(
+    "path, cache_key",
+    [
+        ("", survey_cache_key),
+        ("/questions", survey_questions_cache_key),
+    ],
+)
+async def test_matching_etag_does_not_load_the_read_model(
+    client, admin, survey, path, cache_key
+):
+    url = f"/v1/surveys/{survey['id']}{path}"
+    etag = (await client.get(url, headers=admin)).headers["ETag"]
+    await read_model_cache.invalidate(cache_key(survey["id"]))
+    loads = read_model_cache.loads
+
+    response = await client.get(url, headers=admin | {"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert read_model_cache.loads == loads
+
+
+async def test_cached_read_model_answers_revalidation_without_sql(
+    client, admin, survey
+):
+    url = f"/v1/surveys/{survey['id']}/questions"
+    etag = (await client.get(url, headers=admin)).headers["ETag"]
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await client.get(url, headers=admin | {"If-None-Match": etag})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 304
+    assert statements == []
+
+
+async def test_stale_etag_gets_the_new_read_model(client, admin, survey):
+    url = f"/v1/surveys/{survey['id']}/questions"
+    etag = (await client.get(url, headers=admin)).headers["ETag"]
+    question = survey["questions"][0]
+    edited = await client.put(
+        "/v1/survey/questions/edit",
+        headers=admin,
+        json=question
+        | {
+            "title": "Favourite distribution",
+            "survey_id": survey["id"],
+            "author": survey["author"],
+        },
+    )
+    assert edited.status_code == 201, edited.text
+
+    response = await client.get(url, headers=admin | {"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["title"] == "Favourite distribution"
@@ -0,0 +1,89 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+
+from app import app as app_module
+from app.auth import session_tokens
+from app.auth.session_tokens import (
+    issue_session_token,
+    revocation_list,
+    user_from_claims,
+    verify_session_token,
+)
+from app.db.database import async_session_maker, engine
+from app.db.models import User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def signed_mode(monkeypatch):
+    monkeypatch.setattr(session_tokens, "SESSION_MODE", "signed")
+    monkeypatch.setattr(session_tokens, "SESSION_SECRET", "test-secret")
+    yield
+    revocation_list.token_ids.clear()
+    revocation_list.users.clear()
+
+
+@pytest.fixture
+def user():
+    user = User(
+        email="admin@test.loslc.io", id=uuid4(), username="admin", account_type="admin"
+    )
+    with engine.begin() as connection:
+        connection.execute(insert(User).values(**user.model_dump()))
+    return user
+
+
+async def test_claims_carry_the_user_id(signed_mode, user: User):
+    token, _ = issue_session_token(user)
+
+    claims = verify_session_token(token)
+
+    assert claims is not None
+    assert user_from_claims(claims) == user
+
+
+async def test_role_change_revokes_issued_tokens(signed_mode, user: User):
+    token, _ = issue_session_token(user)
+
+    async with async_session_maker() as db_session:
+        db_user = await db_session.get(User, user.email)
+        assert db_user is not None
+        db_user.account_type = "user"
+        db_session.add(db_user)
+        await db_session.commit()
+
+    assert verify_session_token(token) is None
+    # The row is there for the other workers.
+    async with async_session_maker() as db_session:
+        revocation_list.users.clear()
+        await revocation_list.refresh(db_session)
+    assert verify_session_token(token) is None
+    demoted = user.model_copy(update={"account_type": "user"})
+    assert verify_session_token(issue_session_token(demoted)[0]) is not None
+
+
+async def test_rolled_back_role_change_revokes_nothing(signed_mode, user: User):
+    token, _ = issue_session_token(user)
+
+    async with async_session_maker() as db_session:
+        db_user = await db_session.get(User, user.email)
+        assert db_user is not None
+        db_user.account_type = "user"
+        db_session.add(db_user)
+        await db_session.flush()
+        await db_session.rollback()
+        await revocation_list.refresh(db_session)
+
+    assert verify_session_token(token) is not None
+
+
+async def test_signed_mode_requires_a_secret(monkeypatch):
+    monkeypatch.setattr(app_module, "SESSION_MODE", "signed")
+    monkeypatch.setattr(app_module, "SESSION_SECRET", None)
+
+    with pytest.raises(ValueError, match="SESSION_SECRET"):
+        async with app_module.lifespan(app_module.app):
+            pass
@@ -0,0 +1,147 @@
+"""List endpoints issue a fixed number of statements whatever the page size."""
+
+from typing import Sequence
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.db.database import async_engine, engine
+from app.db.models import Survey, SurveyQuestion, SurveyResponse, User
+
+pytestmark = pytest.mark.anyio
+
+ROWS = 30
+SMALL_PAGE = 2
+LARGE_PAGE = 25
+
+
+@pytest.fixture
+def statements():
+    counter = [0]
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter[0] += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+
+@pytest.fixture
+def authors():
+    """Distinct users, so that a lazy load per row would show as a statement."""
+    emails = [f"author{i}@test.loslc.io" for i in range(ROWS)]
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [
+                {"email": email, "id": uuid4(), "username": email.split("@")[0]}
+                for email in emails
+            ],
+        )
+    return emails
+
+
+def create_survey(author: str, question_authors: Sequence[str] = ()):
+    survey_id = uuid4()
+    question_ids = [uuid4() for _ in question_authors]
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Survey).values(
+                id=survey_id,
+                author_email=author,
+                title="Survey",
+                description="",
+                active=True,
+            )
+        )
+        if question_ids:
+            connection.execute(
+                insert(SurveyQuestion),
+                [
+                    {
+                        "id": question_id,
+                        "survey_id": survey_id,
+                        "author_email": question_author,
+                        "title": "Question",
+                    }
+                    for question_id, question_author in zip(
+                        question_ids, question_authors
+                    )
+                ],
+            )
+    return survey_id, question_ids
+
+
+async def count_statements(client, statements, url: str, headers, **params):
+    # Warm up the session cache, so that both counts see the same lookups. The
+    # request itself stays cold: its response may be cached too.
+    await client.get("/v1/surveys", headers=headers, params={"limit": 1})
+    statements[0] = 0
+    response = await client.get(url, headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return statements[0], response.json()
+
+
+@pytest.mark.parametrize("active", [True, False])
+async def test_survey_listing(client, statements, admin, authors, active: bool):
+    for author in authors:
+        create_survey(author)
+
+    counts = []
+    for limit in (SMALL_PAGE, LARGE_PAGE):
+        count, page = await count_statements(
+            client, statements, "/v1/surveys", admin, limit=limit, active=active
+        )
+        assert len(page["items"]) == limit
+        counts.append(count)
+
+    assert counts[0] == counts[1], counts
+
+
+async def test_survey_questions(client, statements, admin, authors):
+    counts = []
+    for questions in (SMALL_PAGE, LARGE_PAGE):
+        # Each question by someone else, so that loading the authors one
+        # question at a time would add a statement per question.
+        survey_id, _ = create_survey(authors[0], authors[:questions])
+        count, page = await count_statements(
+            client, statements, f"/v1/surveys/{survey_id}/questions", admin
+        )
+        assert len(page) == questions
+        counts.append(count)
+
+    assert counts[0] == counts[1], counts
+
+
+async def test_survey_responses(client, statements, admin, authors):
+    survey_id, question_ids = create_survey(authors[0], authors)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(SurveyResponse),
+            [
+                {
+                    "id": uuid4(),
+                    "responder_email": author,
+                    "question_id": question_id,
+                    "survey_id": survey_id,
+                    "values": ["debian"],
+                }
+                for author, question_id in zip(authors, question_ids)
+            ],
+        )
+
+    counts = []
+    for limit in (SMALL_PAGE, LARGE_PAGE):
+        count, page = await count_statements(
+            client,
+            statements,
+            f"/v1/surveys/{survey_id}/responses",
+            admin,
+            limit=limit,
+        )
+        assert len(page["items"]) == limit
+        counts.append(count)
+
+    assert counts[0] == counts[1], counts
@@ -0,0 +1,247 @@
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def answer(client, headers, survey, question, answers):
+    response = await client.post(
+        f"/v1/surveys/{survey['id']}/responses",
+        headers=headers,
+        json={"answers": [{"question_id": question["id"], "answers": answers}]},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()[0]
+
+
+async def change(client, headers, survey, question, body):
+    return await client.put(
+        "/v1/survey/response/edit",
+        headers=headers,
+        params={"survey_id": survey["id"], "question_id": question["id"]},
+        json=body,
+    )
+
+
+async def test_change_response(client, sign_in, survey):
+    alice = sign_in("alice@test.loslc.io")
+    select = survey["questions"][0]
+    response = await answer(client, alice, survey, select, ["debian"])
+
+    changed = await change(
+        client, alice, survey, select, {**response, "answers": ["fedora"]}
+    )
+
+    assert changed.status_code == 201, changed.text
+    assert changed.json()["answers"] == ["fedora"]
+
+
+async def test_change_someone_elses_response(client, sign_in, admin, survey):
+    alice = sign_in("alice@test.loslc.io")
+    mallory = sign_in("mallory@test.loslc.io")
+    select = survey["questions"][0]
+    response = await answer(client, alice, survey, select, ["debian"])
+
+    changed = await change(
+        client,
+        mallory,
+        survey,
+        select,
+        {
+            **response,
+            "answers": ["windows"],
+            "responder_email": "mallory@test.loslc.io",
+        },
+    )
+
+    assert changed.status_code == 403
+    stored = await client.get(f"/v1/surveys/{survey['id']}/responses", headers=admin)
+    assert [item["answers"] for item in stored.json()["items"]] == [["debian"]]
+
+
+async def test_change_response_of_another_question(client, sign_in, survey):
+    alice = sign_in("alice@test.loslc.io")
+    select, multiselect = survey["questions"][:2]
+    response = await answer(client, alice, survey, select, ["debian"])
+
+    changed = await change(
+        client, alice, survey, multiselect, {**response, "answers": ["gnome"]}
+    )
+
+    assert changed.status_code == 404
+
+
+async def test_change_response_checks_the_question_type(client, sign_in, survey):
+    alice = sign_in("alice@test.loslc.io")
+    select = survey["questions"][0]
+    response = await answer(client, alice, survey, select, ["debian"])
+
+    # response_type is sent by the client and says nothing about the question.
+    changed = await change(
+        client,
+        alice,
+        survey,
+        select,
+        {**response, "answers": ["debian", "arch"], "response_type": "multiselect"},
+    )
+
+    assert changed.status_code == 422
+
+
+async def test_several_responders_answer_the_same_question(
+    client, sign_in, admin, survey
+):
+    select = survey["questions"][0]
+    for name, answers in [
+        ("alice", ["debian"]),
+        ("bob", ["debian"]),
+        ("eve", ["arch"]),
+    ]:
+        await answer(client, sign_in(f"{name}@test.loslc.io"), survey, select, answers)
+
+    results = await client.get(f"/v1/surveys/{survey['id']}/results", headers=admin)
+
+    assert results.json()[0]["answers"] == {"debian": 2, "arch": 1}
+
+
+async def test_answer_the_same_question_twice(client, sign_in, survey):
+    alice = sign_in("alice@test.loslc.io")
+    select = survey["questions"][0]
+    await answer(client, alice, survey, select, ["debian"])
+
+    again = await client.post(
+        f"/v1/surveys/{survey['id']}/responses",
+        headers=alice,
+        json={"answers": [{"question_id": select["id"], "answers": ["arch"]}]},
+    )
+
+    assert again.status_code == 422
+    assert again.json()["detail"][0]["error"] == "Question already answered"
+
+
+async def test_concurrent_submissions_of_the_same_answers(client, sign_in, survey):
+    alice = sign_in("alice@test.loslc.io")
+    body = {
+        "answers": [
+            {"question_id": question["id"], "answers": ["debian"]}
+            for question in survey["questions"]
+            if question["question_type"] != "multiselect"
+        ]
+    }
+
+    responses = await asyncio.gather(
+        *(
+            client.post(
+                f"/v1/surveys/{survey['id']}/responses", headers=alice, json=body
+            )
+            for _ in range(5)
+        )
+    )
+
+    # Requests that pass the "already answered" check together conflict on
+    # the insert; that is a 409, never a 500.
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses[0] == 201
+    assert set(statuses[1:]) <= {409, 422}
+
+
+async def add(client, headers, survey, question, body):
+    return await client.post(
+        f"/v1/surveys/{survey['id']}/response",
+        headers=headers,
+        params={"question_id": question["id"]},
+        json={
+            "survey_id": survey["id"],
+            "question_id": question["id"],
+            "answers": ["debian"],
+            "response_type": question["question_type"],
+            "responder_email": "alice@test.loslc.io",
+        }
+        | body,
+    )
+
+
+async def test_add_response(client, sign_in, admin, survey):
+    alice = sign_in("alice@test.loslc.io")
+    select = survey["questions"][0]
+
+    added = await add(client, alice, survey, select, {})
+
+    assert added.status_code == 201, added.text
+    results = await client.get(f"/v1/surveys/{survey['id']}/results", headers=admin)
+    assert results.json()[0]["answers"] == {"debian": 1}
+
+
+async def test_add_response_checks_the_question_type(client, sign_in, admin, survey):
+    alice = sign_in("alice@test.loslc.io")
+    select = survey["questions"][0]
+
+    added = await add(
+        client,
+        alice,
+        survey,
+        select,
+        {"answers": ["debian", "arch"], "response_type": "multiselect"},
+    )
+
+    assert added.status_code == 422
+    results = await client.get(f"/v1/surveys/{survey['id']}/results", headers=admin)
+    assert results.json()[0]["answers"] == {}
+
+
+async def test_add_response_to_another_question_than_the_path(
+    client, sign_in, admin, survey
+):
+    alice = sign_in("alice@test.loslc.io")
+    select, multiselect = survey["questions"][:2]
+
+    added = await add(
+        client,
+        alice,
+        survey,
+        select,
+        {"question_id": multiselect["id"], "response_type": "multiselect"},
+    )
+
+    assert added.status_code == 400
+    results = await client.get(f"/v1/surveys/{survey['id']}/results", headers=admin)
+    assert [question["answers"] for question in results.json()[:2]] == [{}, {}]
+
+
+async def test_add_response_to_a_question_of_another_survey(
+    client, sign_in, admin, survey
+):
+    alice = sign_in("alice@test.loslc.io")
+    other = await client.post(
+        "/v1/survey/create/nested",
+        headers=admin,
+        json={
+            "title": "Editors",
+            "description": "",
+            "active": True,
+            "author": survey["author"],
+            "questions": [{"title": "Editor", "question_type": "select"}],
+        },
+    )
+    assert other.status_code == 201, other.text
+
+    added = await add(
+        client,
+        alice,
+        survey,
+        other.json()["questions"][0],
+        {"survey_id": survey["id"]},
+    )
+
+    assert added.status_code == 404
+
+
+async def test_add_the_same_response_twice(client, sign_in, survey):
+    alice = sign_in("alice@test.loslc.io")
+    select = survey["questions"][0]
+    assert (await add(client, alice, survey, select, {})).status_code == 201
+
+    again = await add(client, alice, survey, select, {"answers": ["arch"]})
+
+    assert again.status_code == 409